@@ -2,33 +2,55 @@
 
 from __future__ import annotations
 
-import argparse
 import os
 import sys
-from typing import Sequence
-
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import TYPE_CHECKING, Sequence
 
 from . import __version__
-from .api import fetch_models_catalogue
+from .api import OpenRouterClient
 from .models import FREE_MODELS
-from .ui import run_cli
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import argparse
 
 
 def _fetch_free_models_for_cli(api_key: str | None, timeout: int | None) -> list[str]:
+    resolved_key = api_key or os.getenv("OPENROUTER_API_KEY")
+    if not resolved_key:
+        print("Using bundled free model list (set OPENROUTER_API_KEY for live data).")
+        return list(FREE_MODELS)
+
     resolved_timeout = timeout if timeout is not None else 45
     try:
-        models = fetch_models_catalogue(api_key=api_key, timeout=resolved_timeout, free_only=True)
+        client = OpenRouterClient(api_key=resolved_key, timeout=resolved_timeout)
+        models = client.list_models(free_only=True)
     except Exception:
+        print("Using bundled free model list (could not reach OpenRouter).")
         return list(FREE_MODELS)
 
     if not models:
+        print("Using bundled free model list (OpenRouter returned no free models).")
         return list(FREE_MODELS)
     return models
 
 
-def main(argv: Sequence[str] | None = None) -> int:
-    """CLI entry point when executed via `python -m cli_gpt` or the console script."""
+def _positive_int(value: str) -> int:
+    import argparse
+
+    try:
+        parsed = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if parsed <= 0:
+        raise argparse.ArgumentTypeError("must be greater than zero seconds.")
+    return parsed
+
+
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog="cli-gpt",
         description="Chat with OpenRouter free-tier models from your terminal.",
@@ -49,7 +71,7 @@ def main(argv: Sequence[str] | None = None) -> int:
     )
     parser.add_argument(
         "--timeout",
-        type=int,
+        type=_positive_int,
         help="Override the request timeout in seconds (default: 45).",
     )
     parser.add_argument(
@@ -70,29 +92,58 @@ def main(argv: Sequence[str] | None = None) -> int:
         help="Disable full-screen terminal mode.",
     )
     parser.set_defaults(fullscreen=None)
+    history_group = parser.add_mutually_exclusive_group()
+    history_group.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the most recent saved conversation instead of starting a new one.",
+    )
+    history_group.add_argument(
+        "--no-save",
+        dest="save_history",
+        action="store_false",
+        help="Do not save this conversation or its replies to disk.",
+    )
     parser.add_argument(
         "--version",
         action="version",
         version=f"%(prog)s {__version__}",
     )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """CLI entry point when executed via `python -m cli_gpt` or the console script."""
+    if argv is None:
+        argv = sys.argv[1:]
+    # Trivial invocation: answer without building the argparse object graph.
+    if list(argv) == ["--version"]:
+        print(f"cli-gpt {__version__}")
+        return 0
 
+    parser = _build_parser()
     args = parser.parse_args(argv)
-    load_dotenv()
 
-    if args.timeout is not None and args.timeout <= 0:
-        parser.error("--timeout must be greater than zero seconds.")
+    from dotenv import load_dotenv
+
+    load_dotenv()
 
     if args.list_models:
         for name in _fetch_free_models_for_cli(args.api_key, args.timeout):
             print(name)
         return 0
 
+    # Deferred so --help/--version/--list-models never import rich/prompt_toolkit.
+    from .ui import run_cli
+
     return run_cli(
         model=args.model,
         api_key=args.api_key,
         timeout=args.timeout,
         plain_output=args.plain,
         full_screen=args.fullscreen,
+        resume=args.resume,
+        save_history=args.save_history,
     )
 
 
@@ -0,0 +1,97 @@
+"""Background asyncio event loop shared by the synchronous terminal UI."""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Awaitable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _Failure:
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+class BackgroundLoop:
+    """Run an event loop on a daemon thread so blocking callers can drive coroutines.
+
+    Keeping one loop alive for the whole session lets an ``httpx.AsyncClient`` reuse its
+    pooled connections across turns instead of renegotiating TLS every time.
+    """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever,
+            name="cli-gpt-io",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def submit(self, coro: Awaitable[T]) -> Future[T]:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """Block until ``coro`` finishes; Ctrl+C cancels it on the loop."""
+        return self.wait(self.submit(coro))
+
+    def wait(self, future: Future[T]) -> T:
+        """Block on a :meth:`submit` result, cancelling it on Ctrl+C like :meth:`run`."""
+        try:
+            return future.result()
+        except KeyboardInterrupt:
+            future.cancel()
+            raise
+
+    def iterate(self, agen: AsyncIterator[T]) -> Iterator[T]:
+        """Consume an async generator from the calling thread, item by item."""
+        items: queue.Queue[Any] = queue.Queue()
+
+        async def pump() -> None:
+            try:
+                async for item in agen:
+                    items.put(item)
+            except BaseException as exc:  # includes cancellation, re-raised to the consumer
+                items.put(_Failure(exc))
+                raise
+            finally:
+                await agen.aclose()
+            items.put(_DONE)
+
+        future = self.submit(pump())
+        try:
+            while True:
+                item = items.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.exc
+                yield item
+        finally:
+            # Stops the producer (and closes its HTTP stream) if the consumer bails out early.
+            future.cancel()
+
+    def close(self) -> None:
+        """Cancel outstanding work, finalise async generators and stop the thread."""
+        if self.loop.is_closed():
+            return
+        self.submit(self._cancel_pending()).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+    async def _cancel_pending(self) -> None:
+        current = asyncio.current_task()
+        pending = [task for task in asyncio.all_tasks() if task is not current]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        await self.loop.shutdown_asyncgens()
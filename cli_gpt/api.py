@@ -2,17 +2,69 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import os
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
-
-import requests
+import random
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from ._compat import DATACLASS_SLOTS
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up (pip install cli-gpt[fast])
+    orjson = None
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import httpx
+    import requests
+
+# ``requests``, ``httpx`` and ``asyncio`` (plus urllib3, certifi, ...) are imported lazily inside
+# the functions that perform HTTP so `cli-gpt --help`/`--version` never pay for them.
 
 DEFAULT_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 DEFAULT_MODELS_URL = "https://openrouter.ai/api/v1/models"
 DEFAULT_APP_TITLE = "cli-gpt"
 DEFAULT_APP_REFERER = "https://github.com/aoyn1xw/cli-gpt"
 
+# Opt-in (CLI_GPT_PROMPT_PREFIX_HEADER=1): a digest of every message but the newest, so a
+# caching proxy can recognise a conversation prefix it has already tokenised.
+PROMPT_PREFIX_HEADER = "X-Prompt-Prefix"
+
+# Shared sessions keep TCP/TLS connections warm across calls; keyed by API key so
+# credentials never leak between clients.
+_SESSION_CACHE: Dict[Optional[str], requests.Session] = {}
+
+# The free catalogue changes at most daily; empty answers are only trusted briefly.
+MODELS_CACHE_TTL = 24 * 60 * 60
+EMPTY_MODELS_CACHE_TTL = 60
+_CATALOGUE_CACHE: Dict[Tuple[bool, bool, str], Tuple[float, List[str]]] = {}
+
+# Throttling and transient upstream failures are retried with jittered exponential
+# backoff, honouring Retry-After, before the error is surfaced to the caller.
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 4
+_RETRY_BACKOFF = 0.5
+_RETRY_JITTER = 0.3
+_MAX_RETRY_DELAY = 30.0
+
+ChatJob = Tuple[Sequence[Mapping[str, Any]], str]
+
 
 class MissingAPIKeyError(RuntimeError):
     """Raised when an API key is required but not provided."""
@@ -27,13 +79,15 @@ class OpenRouterAPIError(RuntimeError):
         self.message = message
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class OpenRouterClient:
     """Simple client for the OpenRouter API."""
 
     api_key: str
     timeout: int = 45
     session: Optional[requests.Session] = None
+    # Fixed for the client's lifetime; shared by every request, never mutated.
+    _headers: Dict[str, str] = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if not self.api_key:
@@ -41,47 +95,57 @@ class OpenRouterClient:
                 "OPENROUTER_API_KEY is not set. Please export it before running cli-gpt."
             )
         if self.session is None:
-            self.session = requests.Session()
+            self.session = _get_session(self.api_key)
+        self._headers = {**_build_headers(self.api_key), "Content-Type": "application/json"}
 
-    def chat_completion(self, messages: List[Dict[str, Any]], model: str) -> str:
-        payload = {"model": model, "messages": messages}
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": get_app_referer(),
-            "X-Title": get_app_title(),
-        }
+    def chat_completion(self, messages: Sequence[Mapping[str, Any]], model: str) -> str:
+        return "".join(self.stream_chat_completion(messages, model))
 
+    def stream_chat_completion(self, messages: Sequence[Mapping[str, Any]], model: str) -> Iterator[str]:
+        """Yield the assistant reply piece by piece as OpenRouter streams it (SSE)."""
+        import requests
+
+        payload = {"model": model, "messages": messages, "stream": True}
+        prefix_headers = _prompt_prefix_headers(messages)
         try:
             response = self.session.post(
                 get_api_url(),
-                json=payload,
-                headers=headers,
+                data=dumps_json(payload),
+                headers={**self._headers, **prefix_headers} if prefix_headers else self._headers,
                 timeout=self.timeout,
+                stream=True,
             )
         except requests.RequestException as exc:  # pragma: no cover - network issue
             raise RuntimeError(f"Network error: {exc}") from exc
 
-        if not response.ok:
-            self._raise_api_error(response)
-
-        data = response.json()
         try:
-            return data["choices"][0]["message"]["content"]
-        except (KeyError, IndexError, TypeError) as exc:
-            raise RuntimeError("Unexpected API response format.") from exc
+            if not response.ok:
+                self._raise_api_error(response)
+            # SSE bodies are UTF-8; decode ourselves rather than trusting requests'
+            # ISO-8859-1 default for text/* responses without a charset.
+            for raw_line in response.iter_lines():
+                content = _parse_sse_line(raw_line.decode("utf-8"))
+                if content is _SSE_DONE:
+                    break
+                if content:
+                    yield content
+        except requests.RequestException as exc:  # pragma: no cover - network issue
+            raise RuntimeError(f"Network error: {exc}") from exc
+        finally:
+            response.close()
 
-    def list_models(self, *, free_only: bool = True) -> List[str]:
+    def list_models(self, *, free_only: bool = True, use_cache: bool = True) -> List[str]:
         """Fetch available models from the OpenRouter catalogue."""
         return fetch_models_catalogue(
             api_key=self.api_key,
             timeout=self.timeout,
             free_only=free_only,
             session=self.session,
+            use_cache=use_cache,
         )
 
     @staticmethod
-    def _raise_api_error(response: requests.Response) -> None:
+    def _raise_api_error(response: Any) -> None:
         message = "Unknown error"
         try:
             body = response.json()
@@ -92,6 +156,197 @@ class OpenRouterClient:
         raise OpenRouterAPIError(response.status_code, message)
 
 
+@dataclass(**DATACLASS_SLOTS)
+class AsyncOpenRouterClient:
+    """Asynchronous client for the OpenRouter API built on a shared ``httpx.AsyncClient``.
+
+    Use it as an async context manager (or call :meth:`aclose`) so the pooled
+    connections are released once the caller is done issuing requests. With the
+    ``http2`` extra installed, concurrent requests share one multiplexed connection,
+    which makes this the preferred path for batch work over the ``requests`` client.
+    """
+
+    api_key: str
+    timeout: int = 45
+    client: Optional[httpx.AsyncClient] = None
+    _owns_client: bool = field(default=False, init=False, repr=False)
+    # Sent with every chat request (so an injected ``client`` is authenticated too);
+    # fixed for the client's lifetime, never mutated.
+    _headers: Dict[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.api_key:
+            raise MissingAPIKeyError(
+                "OPENROUTER_API_KEY is not set. Please export it before running cli-gpt."
+            )
+        self._headers = {**_build_headers(self.api_key), "Content-Type": "application/json"}
+
+    async def __aenter__(self) -> "AsyncOpenRouterClient":
+        self._ensure_client()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self.client is not None and self._owns_client:
+            await self.client.aclose()
+            self.client = None
+            self._owns_client = False
+
+    async def chat_completion(self, messages: Sequence[Mapping[str, Any]], model: str) -> str:
+        payload = {"model": model, "messages": messages}
+        response = await self._post_with_retries(payload, stream=False)
+        if not response.is_success:
+            OpenRouterClient._raise_api_error(response)
+        return _extract_message_content(_loads(response.content))
+
+    async def stream_chat_completion(
+        self, messages: Sequence[Mapping[str, Any]], model: str
+    ) -> AsyncIterator[str]:
+        """Yield the assistant reply piece by piece as OpenRouter streams it (SSE)."""
+        import httpx
+
+        payload = {"model": model, "messages": messages, "stream": True}
+        response = await self._post_with_retries(payload, stream=True)
+        try:
+            if not response.is_success:
+                await response.aread()
+                OpenRouterClient._raise_api_error(response)
+            async for line in _aiter_sse_lines(response.aiter_bytes()):
+                content = _parse_sse_line(line)
+                if content is _SSE_DONE:
+                    break
+                if content:
+                    yield content
+        except httpx.RequestError as exc:  # pragma: no cover - network issue
+            raise RuntimeError(f"Network error: {exc}") from exc
+        finally:
+            await response.aclose()
+
+    async def chat_completion_many(
+        self, jobs: Sequence[ChatJob], *, concurrency: int = 8
+    ) -> List[Union[str, BaseException]]:
+        """Run several ``(messages, model)`` completions concurrently.
+
+        At most ``concurrency`` requests are in flight at once. Results come back in job
+        order; a failed job yields its exception instead of aborting the whole batch.
+        """
+        import asyncio
+
+        if concurrency <= 0:
+            raise ValueError("Concurrency must be at least 1.")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(job: ChatJob) -> str:
+            messages, model = job
+            async with semaphore:
+                return await self.chat_completion(messages, model)
+
+        return await asyncio.gather(*(run_one(job) for job in jobs), return_exceptions=True)
+
+    def chat_completion_many_sync(
+        self, jobs: Sequence[ChatJob], *, concurrency: int = 8
+    ) -> List[Union[str, BaseException]]:
+        """Blocking wrapper around :meth:`chat_completion_many` for synchronous callers."""
+        import asyncio
+
+        async def run() -> List[Union[str, BaseException]]:
+            async with self:
+                return await self.chat_completion_many(jobs, concurrency=concurrency)
+
+        return asyncio.run(run())
+
+    async def list_models(self, *, free_only: bool = True, use_cache: bool = True) -> List[str]:
+        """Fetch available models from the OpenRouter catalogue."""
+        cache_key = _catalogue_cache_key(self.api_key, free_only)
+        if use_cache:
+            cached = _cached_models(cache_key)
+            if cached is not None:
+                return cached
+
+        import httpx
+
+        client = self._ensure_client()
+        try:
+            response = await client.get(get_models_url(), headers=_build_headers(self.api_key))
+        except httpx.RequestError as exc:  # pragma: no cover - network issue
+            raise RuntimeError(f"Network error while fetching models: {exc}") from exc
+
+        if not response.is_success:
+            OpenRouterClient._raise_api_error(response)
+
+        try:
+            payload = _loads(response.content)
+        except ValueError as exc:
+            raise RuntimeError("Unexpected model list response format.") from exc
+        return _store_models(cache_key, _extract_model_ids(payload, free_only=free_only))
+
+    async def _post_with_retries(self, payload: Dict[str, Any], *, stream: bool) -> httpx.Response:
+        """POST to the chat endpoint, retrying throttled/transient failures before any body is read."""
+        import asyncio
+
+        import httpx
+
+        client = self._ensure_client()
+        prefix_headers = _prompt_prefix_headers(payload["messages"])
+        request = client.build_request(
+            "POST",
+            get_api_url(),
+            content=dumps_json(payload),
+            headers={**self._headers, **prefix_headers} if prefix_headers else self._headers,
+        )
+        attempt = 0
+        while True:
+            try:
+                response = await client.send(request, stream=stream)
+            except httpx.RequestError as exc:  # pragma: no cover - network issue
+                raise RuntimeError(f"Network error: {exc}") from exc
+            if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                return response
+            await response.aclose()
+            await asyncio.sleep(_retry_delay(response, attempt))
+            attempt += 1
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            import httpx
+
+            self.client = httpx.AsyncClient(
+                # Multiplex concurrent requests over one connection when h2 is installed.
+                http2=_http2_available(),
+                limits=httpx.Limits(
+                    max_connections=10,
+                    max_keepalive_connections=10,
+                    keepalive_expiry=60.0,
+                ),
+                timeout=self.timeout,
+                headers=_build_headers(self.api_key),
+            )
+            self._owns_client = True
+        return self.client
+
+
+def get_api_url() -> str:
+    return os.getenv("OPENROUTER_API_URL", DEFAULT_API_URL)
+
+
+def get_models_url() -> str:
+    return os.getenv("OPENROUTER_MODELS_URL", DEFAULT_MODELS_URL)
+
+
+def get_app_title() -> str:
+    return os.getenv("CLI_GPT_APP_TITLE", DEFAULT_APP_TITLE)
+
+
+def get_app_referer() -> str:
+    return os.getenv("CLI_GPT_APP_REFERER", DEFAULT_APP_REFERER)
+
+
+def get_prompt_prefix_enabled() -> bool:
+    return env_flag("CLI_GPT_PROMPT_PREFIX_HEADER")
+
+
 def get_api_key() -> str:
     """Fetch the API key from the environment or raise a clear error."""
     key = os.getenv("OPENROUTER_API_KEY")
@@ -103,26 +358,48 @@ def get_api_key() -> str:
     return key
 
 
+def env_flag(name: str) -> bool:
+    """Return whether the opt-in environment switch ``name`` is set to a truthy value."""
+    return os.getenv(name, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def dumps_json(payload: Any, *, sort_keys: bool = False) -> bytes:
+    """Encode ``payload`` as UTF-8 JSON bytes, using ``orjson`` when it is installed."""
+    # ``default=dict`` covers read-only mappings such as the UI's shared system prompt.
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS if sort_keys else None
+        return orjson.dumps(payload, default=dict, option=option)
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=sort_keys, default=dict)
+    return encoded.encode("utf-8")
+
+
 def fetch_models_catalogue(
     *,
     api_key: Optional[str] = None,
     timeout: int = 45,
     free_only: bool = True,
     session: Optional[requests.Session] = None,
+    use_cache: bool = True,
 ) -> List[str]:
-    """Fetch model ids from OpenRouter, optionally without auth for public catalogue access."""
-    active_session = session or requests.Session()
-    headers = {
-        "HTTP-Referer": APP_REFERER,
-        "X-Title": APP_TITLE,
-    }
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
+    """Fetch model ids from OpenRouter, optionally without auth for public catalogue access.
+
+    Results are memoised in-process (see ``MODELS_CACHE_TTL``); pass ``use_cache=False``
+    to force a round-trip and refresh the cached copy.
+    """
+    cache_key = _catalogue_cache_key(api_key, free_only)
+    if use_cache:
+        cached = _cached_models(cache_key)
+        if cached is not None:
+            return cached
+
+    import requests
+
+    active_session = session or _get_session(api_key)
 
     try:
         response = active_session.get(
-            MODELS_URL,
-            headers=headers,
+            get_models_url(),
+            headers=_build_headers(api_key),
             timeout=timeout,
         )
     except requests.RequestException as exc:  # pragma: no cover - network issue
@@ -132,56 +409,220 @@ def fetch_models_catalogue(
         OpenRouterClient._raise_api_error(response)
 
     try:
-        payload = response.json()
+        payload = _loads(response.content)
     except ValueError as exc:
         raise RuntimeError("Unexpected model list response format.") from exc
+    return _store_models(cache_key, _extract_model_ids(payload, free_only=free_only))
+
+
+def invalidate_models_cache() -> None:
+    """Drop memoised model catalogues so the next lookup hits the API."""
+    _CATALOGUE_CACHE.clear()
+
+
+def _catalogue_cache_key(api_key: Optional[str], free_only: bool) -> Tuple[bool, bool, str]:
+    return (bool(api_key), free_only, get_models_url())
+
+
+def _cached_models(cache_key: Tuple[bool, bool, str]) -> Optional[List[str]]:
+    entry = _CATALOGUE_CACHE.get(cache_key)
+    if entry is None:
+        return None
+    stored_at, models = entry
+    ttl = MODELS_CACHE_TTL if models else EMPTY_MODELS_CACHE_TTL
+    if time.monotonic() - stored_at >= ttl:
+        del _CATALOGUE_CACHE[cache_key]
+        return None
+    return list(models)
 
+
+def _store_models(cache_key: Tuple[bool, bool, str], models: List[str]) -> List[str]:
+    _CATALOGUE_CACHE[cache_key] = (time.monotonic(), models)
+    return list(models)
+
+
+def _loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _get_session(api_key: Optional[str]) -> requests.Session:
+    session = _SESSION_CACHE.get(api_key)
+    if session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        retry_options: Dict[str, Any] = {
+            "total": MAX_RETRIES,
+            "backoff_factor": _RETRY_BACKOFF,
+            "status_forcelist": RETRY_STATUS_CODES,
+            "allowed_methods": frozenset(["GET", "POST"]),
+            "respect_retry_after_header": True,
+            # Hand the final error response back so it can be reported verbatim.
+            "raise_on_status": False,
+        }
+        try:
+            retry = Retry(backoff_jitter=_RETRY_JITTER, **retry_options)
+        except TypeError:  # pragma: no cover - urllib3 < 2 has no jitter support
+            retry = Retry(**retry_options)
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _SESSION_CACHE[api_key] = session
+    return session
+
+
+def _http2_available() -> bool:
+    import importlib.util
+
+    return importlib.util.find_spec("h2") is not None
+
+
+def _retry_delay(response: Any, attempt: int) -> float:
+    """Honour ``Retry-After`` (in seconds) when present, else back off with jitter."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            return min(max(float(retry_after), 0.0), _MAX_RETRY_DELAY)
+        except ValueError:
+            pass
+    delay = _RETRY_BACKOFF * (2**attempt) + random.uniform(0, _RETRY_JITTER)
+    return min(delay, _MAX_RETRY_DELAY)
+
+
+def _build_headers(api_key: Optional[str]) -> Dict[str, str]:
+    """Return the shared (read-only) header dict for this key and the current env settings."""
+    return _headers_for(api_key, get_app_referer(), get_app_title())
+
+
+@lru_cache(maxsize=8)
+def _headers_for(api_key: Optional[str], referer: str, title: str) -> Dict[str, str]:
+    headers = {
+        "HTTP-Referer": referer,
+        "X-Title": title,
+    }
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    return headers
+
+
+def _prompt_prefix_headers(messages: Sequence[Mapping[str, Any]]) -> Dict[str, str]:
+    """Return the ``X-Prompt-Prefix`` header for ``messages`` when enabled, else ``{}``."""
+    if len(messages) < 2 or not get_prompt_prefix_enabled():
+        return {}
+    digest = hashlib.sha256(dumps_json(list(messages[:-1]))).hexdigest()
+    return {PROMPT_PREFIX_HEADER: digest}
+
+
+_SSE_DONE = object()
+
+
+async def _aiter_sse_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split an SSE byte stream into lines on ``\n`` only.
+
+    ``aiter_lines()`` also breaks on U+2028, U+2029 and U+0085, which JSON allows
+    unescaped inside strings, so a delta containing one would be cut in half.
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield (line[:-1] if line.endswith(b"\r") else line).decode("utf-8")
+    if buffer:
+        yield (buffer[:-1] if buffer.endswith(b"\r") else buffer).decode("utf-8")
+
+
+def _parse_sse_line(line: str) -> Any:
+    """Return the content delta carried by one SSE line.
+
+    Yields ``None`` for lines without content (keep-alives, comments, role-only deltas)
+    and the ``_SSE_DONE`` sentinel once the stream signals completion.
+    """
+    if not line.startswith("data:"):
+        return None
+    data = line[5:].strip()
+    if data == "[DONE]":
+        return _SSE_DONE
+    try:
+        chunk = _loads(data)
+    except ValueError as exc:
+        raise RuntimeError("Unexpected streaming response format.") from exc
+    if not isinstance(chunk, dict):
+        raise RuntimeError("Unexpected streaming response format.")
+
+    error = chunk.get("error")
+    if error:
+        # OpenRouter reports failures after the 200 header as an in-band error event.
+        code = error.get("code") if isinstance(error, dict) else None
+        message = error.get("message") if isinstance(error, dict) else str(error)
+        raise OpenRouterAPIError(code if isinstance(code, int) else 500, message or "Unknown error")
+
+    choices = chunk.get("choices")
+    if not isinstance(choices, list) or not choices or not isinstance(choices[0], dict):
+        return None
+    delta = choices[0].get("delta")
+    if not isinstance(delta, dict):
+        return None
+    return delta.get("content")
+
+
+def _extract_message_content(data: Any) -> str:
+    try:
+        return data["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError) as exc:
+        raise RuntimeError("Unexpected API response format.") from exc
+
+
+def _extract_model_ids(payload: Any, *, free_only: bool) -> List[str]:
+    if not isinstance(payload, dict):
+        raise RuntimeError("Model list payload missing 'data' array.")
     data = payload.get("data")
     if not isinstance(data, list):
         raise RuntimeError("Model list payload missing 'data' array.")
 
+    # Filter and dedupe in a single pass, preserving catalogue order.
+    seen = set()
+    add_seen = seen.add
     models: List[str] = []
     for item in data:
         if not isinstance(item, dict):
             continue
         model_id = item.get("id")
-        if not isinstance(model_id, str):
+        if not isinstance(model_id, str) or model_id in seen:
             continue
         if free_only and not _is_model_free(model_id=model_id, pricing=item.get("pricing")):
             continue
+        add_seen(model_id)
         models.append(model_id)
-
-    # Preserve order but remove duplicates.
-    seen = set()
-    deduped: List[str] = []
-    for model_id in models:
-        if model_id in seen:
-            continue
-        seen.add(model_id)
-        deduped.append(model_id)
-    return deduped
+    return models
 
 
 def _is_model_free(*, model_id: str, pricing: Any) -> bool:
-    if model_id.lower().endswith(":free"):
+    # Only the suffix needs case-folding, not the whole id.
+    if model_id[-5:].lower() == ":free":
         return True
     if not isinstance(pricing, dict):
         return False
-    prompt_price = pricing.get("prompt")
-    completion_price = pricing.get("completion")
-    return _is_zero_cost(prompt_price) and _is_zero_cost(completion_price)
+    return _is_zero_cost(pricing.get("prompt")) and _is_zero_cost(pricing.get("completion"))
+
+
+_ZERO_STRINGS = frozenset({"0", "0.0", "0.00", "free"})
 
 
 def _is_zero_cost(value: Any) -> bool:
     if value is None:
         return False
     if isinstance(value, (int, float)):
-        return float(value) == 0.0
+        return not value
     if isinstance(value, str):
         trimmed = value.strip().lower()
         if not trimmed:
             return False
-        if trimmed in {"0", "0.0", "0.00", "free"}:
+        if trimmed in _ZERO_STRINGS:
             return True
         try:
             return float(trimmed) == 0.0
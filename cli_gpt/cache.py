@@ -0,0 +1,235 @@
+"""Client-side caches that let cli-gpt skip redundant OpenRouter round-trips."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .api import dumps_json, get_models_url
+
+
+# The startup catalogue copy on disk is trusted for this long before hitting the API.
+MODELS_DISK_CACHE_TTL = 15 * 60
+
+
+def get_cache_dir() -> Path:
+    """Return the per-user cache directory (``CLI_GPT_CACHE_DIR`` overrides it)."""
+    override = os.getenv("CLI_GPT_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+    return Path(os.getenv("XDG_CACHE_HOME") or "~/.cache").expanduser() / "cli-gpt"
+
+
+def load_cached_models(max_age: float = MODELS_DISK_CACHE_TTL) -> Optional[List[str]]:
+    """Return the on-disk model catalogue if it is younger than ``max_age`` seconds."""
+    path = get_cache_dir() / "models.json"
+    try:
+        if path.stat().st_mtime < time.time() - max_age:
+            return None
+        with path.open("r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("models_url") != get_models_url():
+        return None
+    models = payload.get("models")
+    if not isinstance(models, list) or not all(isinstance(model, str) for model in models):
+        return None
+    return models
+
+
+def store_cached_models(models: List[str]) -> None:
+    """Atomically persist the model catalogue; failures only cost a future round-trip."""
+    directory = get_cache_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".models-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump({"models_url": get_models_url(), "models": models}, handle)
+            os.replace(tmp_path, directory / "models.json")
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+def response_cache_key(messages: Sequence[Mapping[str, Any]], model: str) -> str:
+    """Return a stable digest identifying an exact (model, conversation) pair."""
+    payload = {"m": model, "msgs": messages}
+    return hashlib.sha256(dumps_json(payload, sort_keys=True)).hexdigest()
+
+
+class ResponseCache:
+    """Bounded LRU map from :func:`response_cache_key` digests to assistant replies."""
+
+    def __init__(self, maxsize: int = 512):
+        if maxsize <= 0:
+            raise ValueError("Cache size must be at least 1.")
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        response = self._entries.get(key)
+        if response is not None:
+            self._entries.move_to_end(key)
+        return response
+
+    def put(self, key: str, response: str) -> None:
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+Embedder = Callable[[str], Sequence[float]]
+
+
+class SemanticCache:
+    """Reuse replies for paraphrased prompts by comparing prompt embeddings.
+
+    Entries are namespaced by model and expire after ``ttl`` seconds. A stored reply is
+    returned when the cosine similarity between prompts reaches ``threshold``.
+    """
+
+    def __init__(
+        self,
+        embed: Embedder,
+        *,
+        threshold: float = 0.92,
+        ttl: float = 24 * 60 * 60,
+        maxsize: int = 256,
+    ):
+        self.embed = embed
+        self.threshold = threshold
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[str, List[Tuple[float, List[float], str]]] = {}
+        # With numpy, each model's vectors are also kept as one (N, D) matrix, updated
+        # whenever entries are added or expire, so a lookup is a single mat-vec product.
+        self._matrices: Dict[str, Any] = {}
+        self._last_prompt: Optional[Tuple[str, List[float]]] = None
+
+    def lookup(self, prompt: str, model: str) -> Optional[str]:
+        query = self._embedding(prompt)
+        entries = self._live_entries(model)
+        if not entries:
+            return None
+        scores = self._scores(model, query, entries)
+        best = max(range(len(scores)), key=scores.__getitem__)
+        if scores[best] >= self.threshold:
+            return entries[best][2]
+        return None
+
+    def store(self, prompt: str, model: str, response: str) -> None:
+        entries = self._live_entries(model)
+        vector = self._embedding(prompt)
+        entries.append((time.monotonic(), vector, response))
+        np = _numpy()
+        if np is not None:
+            row = np.asarray(vector)[np.newaxis, :]
+            matrix = self._matrices.get(model)
+            self._matrices[model] = row if matrix is None else np.vstack((matrix, row))
+        if len(entries) > self.maxsize:
+            self._drop_oldest(model, entries, len(entries) - self.maxsize)
+
+    def warm_up(self) -> None:
+        """Embed a throwaway prompt so the embedding model is loaded before the first turn."""
+        self.embed("warm-up")
+
+    def _embedding(self, prompt: str) -> List[float]:
+        # lookup() followed by store() for the same prompt embeds only once.
+        if self._last_prompt is not None and self._last_prompt[0] == prompt:
+            return self._last_prompt[1]
+        vector = _normalise(self.embed(prompt))
+        self._last_prompt = (prompt, vector)
+        return vector
+
+    def _live_entries(self, model: str) -> List[Tuple[float, List[float], str]]:
+        entries = self._entries.setdefault(model, [])
+        cutoff = time.monotonic() - self.ttl
+        # Entries are appended in time order, so expired ones are always a prefix.
+        expired = 0
+        while expired < len(entries) and entries[expired][0] < cutoff:
+            expired += 1
+        if expired:
+            self._drop_oldest(model, entries, expired)
+        return entries
+
+    def _drop_oldest(
+        self, model: str, entries: List[Tuple[float, List[float], str]], count: int
+    ) -> None:
+        del entries[:count]
+        matrix = self._matrices.get(model)
+        if matrix is not None:
+            self._matrices[model] = matrix[count:]
+
+    def _scores(
+        self, model: str, query: List[float], entries: List[Tuple[float, List[float], str]]
+    ) -> List[float]:
+        """Cosine similarity of ``query`` against the model's already-normalised vectors."""
+        np = _numpy()
+        if np is not None:
+            return (self._matrices[model] @ np.asarray(query)).tolist()
+        return [sum(a * b for a, b in zip(query, vector)) for _, vector, _ in entries]
+
+
+def ollama_embedder(
+    base_url: str, model: str = "nomic-embed-text", *, timeout: float = 5.0
+) -> Embedder:
+    """Build an embedder backed by a local Ollama server's ``/api/embeddings`` endpoint."""
+    import requests
+
+    session = requests.Session()
+    url = base_url.rstrip("/") + "/api/embeddings"
+
+    def embed(text: str) -> Sequence[float]:
+        response = session.post(url, json={"model": model, "prompt": text}, timeout=timeout)
+        response.raise_for_status()
+        embedding = response.json().get("embedding")
+        if not isinstance(embedding, list) or not embedding:
+            raise RuntimeError("Embedding server returned no vector.")
+        return embedding
+
+    return embed
+
+
+def semantic_cache_from_env() -> Optional[SemanticCache]:
+    """Return a semantic cache when ``CLI_GPT_EMBEDDINGS_URL`` points at an Ollama server."""
+    base_url = os.getenv("CLI_GPT_EMBEDDINGS_URL")
+    if not base_url:
+        return None
+    model = os.getenv("CLI_GPT_EMBEDDINGS_MODEL", "nomic-embed-text")
+    return SemanticCache(ollama_embedder(base_url, model))
+
+
+def _normalise(vector: Sequence[float]) -> List[float]:
+    norm = math.sqrt(sum(value * value for value in vector))
+    if not norm:
+        raise ValueError("Cannot index a zero-length embedding.")
+    return [value / norm for value in vector]
+
+
+@lru_cache(maxsize=1)
+def _numpy() -> Any:
+    # numpy is optional and slow to import, so it is only loaded once a lookup needs it.
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - pure-Python fallback
+        return None
+    return numpy
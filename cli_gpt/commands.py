@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Dict, Optional
 
+from ._compat import DATACLASS_SLOTS
 from .models import ModelManager
 
 
@@ -13,17 +15,42 @@ HELP_TEXT = (
     "/help          really?\n"
     "/switch [model]  Switch to another model (no argument opens selector)\n"
     "/new             Start a new chat (clears message history)\n"
+    "/list [--refresh]  Show models (--refresh bypasses the catalogue cache)\n"
+    "/nocache <prompt>  Send a prompt without using the response cache\n"
     "/quit, /exit   take a wild guess?"
 )
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class CommandResult:
     handled: bool
     exit: bool = False
     message: Optional[str] = None
     clear_history: bool = False
     show_models: bool = False
+    refresh_models: bool = False
+    uncached_prompt: Optional[str] = None
+
+
+# Results are immutable, so the common ones are shared instead of rebuilt per command.
+_NOT_HANDLED = CommandResult(handled=False)
+_EMPTY_COMMAND = CommandResult(handled=True, message="Empty command. Type /help for options.")
+_EXIT = CommandResult(handled=True, exit=True)
+_HELP = CommandResult(handled=True, message=HELP_TEXT)
+_SHOW_MODELS = CommandResult(handled=True, show_models=True)
+_NEW_CHAT = CommandResult(handled=True, clear_history=True, message="Started a new chat.")
+_NOCACHE_USAGE = CommandResult(handled=True, message="Usage: /nocache <prompt>")
+_LIST_MODELS = CommandResult(
+    handled=True,
+    show_models=True,
+    message="Tip: use /switch to pick a model.",
+)
+_LIST_MODELS_REFRESH = CommandResult(
+    handled=True,
+    show_models=True,
+    refresh_models=True,
+    message="Tip: use /switch to pick a model.",
+)
 
 
 class CommandProcessor:
@@ -34,35 +61,24 @@ class CommandProcessor:
 
     def process(self, text: str) -> CommandResult:
         if not text.startswith("/"):
-            return CommandResult(handled=False)
+            return _NOT_HANDLED
 
         command_parts = text[1:].strip().split(maxsplit=1)
         if not command_parts:
-            return CommandResult(handled=True, message="Empty command. Type /help for options.")
+            return _EMPTY_COMMAND
 
-        command = command_parts[0].lower()
+        # Interned so the _HANDLERS lookup compares keys by identity.
+        command = sys.intern(command_parts[0].lower())
         argument = command_parts[1].strip() if len(command_parts) > 1 else ""
 
-        if command in {"quit", "exit"}:
-            return CommandResult(handled=True, exit=True)
-        if command == "help":
-            return CommandResult(handled=True, message=HELP_TEXT)
-        if command in {"switch", "model"}:
-            return self._handle_switch(argument)
-        if command in {"new", "clear"}:
-            return CommandResult(handled=True, clear_history=True, message="Started a new chat.")
-        if command == "list":
-            return CommandResult(
-                handled=True,
-                show_models=True,
-                message="Tip: use /switch to pick a model.",
-            )
-
-        return CommandResult(handled=True, message=f"Unknown command: /{command}. Type /help.")
+        handler = _HANDLERS.get(command)
+        if handler is None:
+            return CommandResult(handled=True, message=_UNKNOWN_TEMPLATE.format(command))
+        return handler(self, argument)
 
     def _handle_switch(self, argument: str) -> CommandResult:
         if not argument:
-            return CommandResult(handled=True, show_models=True)
+            return _SHOW_MODELS
 
         try:
             self.model_manager.set_model(argument)
@@ -73,3 +89,41 @@ class CommandProcessor:
             handled=True,
             message=f"Switched model to {self.model_manager.current_model}",
         )
+
+
+def _handle_exit(processor: CommandProcessor, argument: str) -> CommandResult:
+    return _EXIT
+
+
+def _handle_help(processor: CommandProcessor, argument: str) -> CommandResult:
+    return _HELP
+
+
+def _handle_new(processor: CommandProcessor, argument: str) -> CommandResult:
+    return _NEW_CHAT
+
+
+def _handle_list(processor: CommandProcessor, argument: str) -> CommandResult:
+    return _LIST_MODELS_REFRESH if argument == "--refresh" else _LIST_MODELS
+
+
+def _handle_nocache(processor: CommandProcessor, argument: str) -> CommandResult:
+    if not argument:
+        return _NOCACHE_USAGE
+    return CommandResult(handled=True, uncached_prompt=argument)
+
+
+_UNKNOWN_TEMPLATE = "Unknown command: /{}. Type /help."
+
+# Built once at import time so dispatch is a single dict lookup per command.
+_HANDLERS: Dict[str, Callable[[CommandProcessor, str], CommandResult]] = {
+    "quit": _handle_exit,
+    "exit": _handle_exit,
+    "help": _handle_help,
+    "switch": CommandProcessor._handle_switch,
+    "model": CommandProcessor._handle_switch,
+    "new": _handle_new,
+    "clear": _handle_new,
+    "list": _handle_list,
+    "nocache": _handle_nocache,
+}
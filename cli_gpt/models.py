@@ -1,7 +1,9 @@
 """Model management for the cli-gpt app."""
 
 from dataclasses import dataclass, field
-from typing import Iterable, List
+from typing import FrozenSet, Iterable, List, Tuple
+
+from ._compat import DATACLASS_SLOTS
 
 FREE_MODELS: List[str] = [
     "qwen/qwen3-235b-a22b:free",
@@ -10,41 +12,47 @@ FREE_MODELS: List[str] = [
 DEFAULT_MODEL: str = FREE_MODELS[0]
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ModelManager:
     """Maintain the currently selected model."""
 
     available_models: List[str] = field(default_factory=lambda: list(FREE_MODELS))
     current_model: str = DEFAULT_MODEL
+    # Read-only views rebuilt whenever the catalogue changes.
+    _available_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    _available_tuple: Tuple[str, ...] = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if not self.available_models:
             self.available_models = list(FREE_MODELS)
-        if self.current_model not in self.available_models:
+        self._index_models()
+        if self.current_model not in self._available_set:
             self.current_model = self.available_models[0]
 
     def set_model(self, name: str, *, allow_unknown: bool = False) -> None:
-        if not allow_unknown and name not in self.available_models:
+        if not allow_unknown and name not in self._available_set:
             raise ValueError(f"Model '{name}' is not available in free tier.")
         self.current_model = name
 
-    def list_models(self) -> List[str]:
-        return list(self.available_models)
+    def is_available(self, name: str) -> bool:
+        return name in self._available_set
 
-    def replace_models(self, models: Iterable[str]) -> None:
-        new_models: List[str] = []
-        seen = set()
-        for model in models:
-            if not isinstance(model, str):
-                continue
-            if model in seen:
-                continue
-            seen.add(model)
-            new_models.append(model)
+    def list_models(self) -> Tuple[str, ...]:
+        return self._available_tuple
 
+    def replace_models(self, models: Iterable[str]) -> None:
+        new_models = list(dict.fromkeys(model for model in models if isinstance(model, str)))
         if not new_models:
             return
 
-        self.available_models = new_models
-        if self.current_model not in self.available_models:
+        # An unchanged catalogue keeps its tuple, so identity-keyed caches built from
+        # list_models() (e.g. the model popup's index) stay valid across refreshes.
+        if new_models != self.available_models:
+            self.available_models = new_models
+            self._index_models()
+        if self.current_model not in self._available_set:
             self.current_model = self.available_models[0]
+
+    def _index_models(self) -> None:
+        self._available_tuple = tuple(self.available_models)
+        self._available_set = frozenset(self._available_tuple)
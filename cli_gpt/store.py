@@ -0,0 +1,138 @@
+"""SQLite-backed persistence for chat history and replies across cli-gpt runs."""
+
+from __future__ import annotations
+
+import gzip
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .cache import get_cache_dir
+
+# Persisted replies are reused for identical conversations for this long.
+RESPONSE_STORE_TTL = 7 * 24 * 60 * 60
+# Only the most recent conversations are kept; older ones are pruned when the store opens.
+MAX_SAVED_SESSIONS = 50
+# Message and reply text larger than this is stored gzip-compressed (as a BLOB).
+COMPRESS_THRESHOLD = 8 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    session_id INTEGER NOT NULL,
+    idx INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    PRIMARY KEY (session_id, idx)
+);
+CREATE TABLE IF NOT EXISTS response_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created REAL NOT NULL
+);
+"""
+
+
+class StateStore:
+    """Chat sessions and exact-match replies in ``state.db`` under the cache directory.
+
+    The database runs in WAL mode with autocommit, so each appended message or cached
+    reply is a single cheap write that never blocks readers. Opening the store prunes
+    expired replies and all but the newest ``max_sessions`` conversations. Callers treat
+    :class:`sqlite3.Error` from any method as "persistence unavailable".
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        *,
+        ttl: float = RESPONSE_STORE_TTL,
+        max_sessions: int = MAX_SAVED_SESSIONS,
+    ):
+        self.path = Path(path) if path is not None else get_cache_dir() / "state.db"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._conn = sqlite3.connect(str(self.path), isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._prune()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # Sessions -------------------------------------------------------------
+    def new_session(self) -> int:
+        cursor = self._conn.execute("INSERT INTO sessions (created) VALUES (?)", (time.time(),))
+        return int(cursor.lastrowid)
+
+    def latest_session(self) -> Optional[int]:
+        """Return the most recent session that has at least one message."""
+        row = self._conn.execute("SELECT MAX(session_id) FROM messages").fetchone()
+        return row[0] if row and row[0] is not None else None
+
+    def load_messages(self, session_id: int) -> List[Dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT role, content FROM messages WHERE session_id = ? ORDER BY idx",
+            (session_id,),
+        )
+        # SQLite hands back a new str per row; interning shares the few role values.
+        return [{"role": sys.intern(role), "content": _decode(content)} for role, content in rows]
+
+    def append_message(self, session_id: int, idx: int, role: str, content: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO messages (session_id, idx, role, content) VALUES (?, ?, ?, ?)",
+            (session_id, idx, role, _encode(content)),
+        )
+
+    # Replies --------------------------------------------------------------
+    def get_response(self, key: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT response FROM response_cache WHERE key = ? AND created >= ?",
+            (key, time.time() - self.ttl),
+        ).fetchone()
+        return _decode(row[0]) if row else None
+
+    def put_response(self, key: str, model: str, response: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO response_cache (key, model, response, created) "
+            "VALUES (?, ?, ?, ?)",
+            (key, model, _encode(response), time.time()),
+        )
+
+    # Retention ------------------------------------------------------------
+    def _prune(self) -> None:
+        self._conn.execute(
+            "DELETE FROM response_cache WHERE created < ?", (time.time() - self.ttl,)
+        )
+        self._conn.execute(
+            "DELETE FROM messages WHERE session_id NOT IN ("
+            "SELECT DISTINCT session_id FROM messages ORDER BY session_id DESC LIMIT ?)",
+            (self.max_sessions,),
+        )
+        # Also drops sessions that never got a message (e.g. /new followed by /quit).
+        self._conn.execute(
+            "DELETE FROM sessions WHERE id NOT IN (SELECT DISTINCT session_id FROM messages)"
+        )
+
+
+def _encode(text: str) -> Union[str, bytes]:
+    # Short text stays TEXT so the common case costs nothing; SQLite columns are
+    # dynamically typed, so the stored type alone marks which rows are compressed.
+    data = text.encode("utf-8")
+    if len(data) <= COMPRESS_THRESHOLD:
+        return text
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decode(value: Union[str, bytes]) -> str:
+    if isinstance(value, bytes):
+        return gzip.decompress(value).decode("utf-8")
+    return value
@@ -2,56 +2,150 @@
 
 from __future__ import annotations
 
-from contextlib import contextmanager
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
-
-from dotenv import load_dotenv
-from prompt_toolkit import PromptSession
-from prompt_toolkit.application import Application
-from prompt_toolkit.buffer import Buffer
-from prompt_toolkit.filters import Condition, has_focus
-from prompt_toolkit.key_binding import KeyBindings
-from prompt_toolkit.layout import Layout, ScrollOffsets
-from prompt_toolkit.layout.containers import ConditionalContainer, HSplit, VSplit, Window, WindowAlign
-from prompt_toolkit.layout.controls import BufferControl, FormattedTextControl
-from prompt_toolkit.layout.dimension import Dimension
-from prompt_toolkit.patch_stdout import patch_stdout
-from prompt_toolkit.styles import Style
-from rich import box
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
-
-from .api import MissingAPIKeyError, OpenRouterClient, get_api_key
+from functools import lru_cache
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from ._loop import BackgroundLoop
+from .api import AsyncOpenRouterClient, MissingAPIKeyError, env_flag, get_api_key
+from .cache import (
+    ResponseCache,
+    SemanticCache,
+    load_cached_models,
+    response_cache_key,
+    semantic_cache_from_env,
+    store_cached_models,
+)
 from .commands import CommandProcessor
 from .models import ModelManager
+from .store import StateStore
 
-SYSTEM_PROMPT = {
-    "role": "system",
-    "content": "You are a helpful assistant. If you are unsure, say so clearly and do not fabricate facts.",
-}
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from concurrent.futures import Future
+
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.styles import Style
+    from rich.console import Console
+    from rich.panel import Panel
+
+# prompt_toolkit, rich and dotenv are imported where they are first needed: the model
+# popup's layout stack, panels and live views are only loaded on the paths that draw them.
+
+# Shown while waiting for the first streamed token.
+TYPING_MESSAGE = "AI is thinking..."
+SPINNER_FRAMES = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+SPINNER_INTERVAL = 0.1
+
+# Delay between the last keystroke in the model filter and the re-filter/redraw.
+FILTER_DEBOUNCE_SECONDS = 0.03
+# Catalogues larger than this are filtered through a trigram index instead of a scan.
+TRIGRAM_INDEX_MIN_MODELS = 500
+
+SUMMARY_PROMPT = (
+    "Summarise the conversation below in a few sentences for your own future reference. "
+    "Keep names, decisions and open questions; omit pleasantries."
+)
+
+SYSTEM_PROMPT_TEXT = sys.intern(
+    "You are a helpful assistant. If you are unsure, say so clearly and do not fabricate facts."
+)
+# Role strings are interned so every message dict, including restored ones, shares them.
+SYSTEM_ROLE = sys.intern("system")
+USER_ROLE = sys.intern("user")
+ASSISTANT_ROLE = sys.intern("assistant")
+
+# Read-only so every conversation can share the same object instead of copying it.
+SYSTEM_PROMPT = MappingProxyType({"role": SYSTEM_ROLE, "content": SYSTEM_PROMPT_TEXT})
 
 
 @dataclass
 class ChatState:
-    """Track chat history."""
-
-    history: List[Dict[str, Any]] = field(default_factory=lambda: [SYSTEM_PROMPT.copy()])
+    """Track chat history.
+
+    Every history starts with the shared, read-only system prompt:
+
+    >>> state = ChatState()
+    >>> state.history[0] is SYSTEM_PROMPT
+    True
+    >>> SYSTEM_PROMPT["role"] = "user"
+    Traceback (most recent call last):
+    ...
+    TypeError: 'mappingproxy' object does not support item assignment
+    """
+
+    history: List[Mapping[str, Any]] = field(default_factory=lambda: [SYSTEM_PROMPT])
+    # Only the most recent turns (a user prompt plus its reply) are sent to the API, so
+    # prompt size and per-request latency stay bounded in long sessions.
+    max_history_turns: int = 20
+    max_context_chars: int = 24000
+    # Optional recap of turns that fell out of the window, sent after the system prompt.
+    summary: Optional[str] = None
+    _summarised: int = field(default=0, init=False, repr=False)
 
     def reset(self) -> None:
-        self.history = [SYSTEM_PROMPT.copy()]
+        self.history = [SYSTEM_PROMPT]
+        self.summary = None
+        self._summarised = 0
 
     def add_user_message(self, content: str) -> None:
-        self.history.append({"role": "user", "content": content})
+        self.history.append({"role": USER_ROLE, "content": content})
 
     def add_ai_message(self, content: str) -> None:
-        self.history.append({"role": "assistant", "content": content})
-
-    def messages(self) -> List[Dict[str, Any]]:
-        # Return a shallow copy to avoid accidental mutation.
-        return list(self.history)
+        self.history.append({"role": ASSISTANT_ROLE, "content": content})
+
+    def messages(self) -> List[Mapping[str, Any]]:
+        """Return the system prompt, any summary and the turns that fit the window."""
+        start = self._window_start()
+        window: List[Mapping[str, Any]] = [self.history[0]]
+        if self.summary:
+            window.append({"role": SYSTEM_ROLE, "content": f"Summary so far: {self.summary}"})
+        window.extend(self.history[start:])
+        return window
+
+    def unsummarised_messages(self) -> List[Mapping[str, Any]]:
+        """Return messages that dropped out of the window since the last summary."""
+        return self.history[1 + self._summarised : self._window_start(next_prompt=True)]
+
+    def apply_summary(self, summary: str) -> None:
+        """Record ``summary`` as covering every message outside the current window."""
+        self.summary = summary
+        self._summarised = self._window_start(next_prompt=True) - 1
+
+    def _window_start(self, *, next_prompt: bool = False) -> int:
+        # ``next_prompt`` sizes the window as it will be once another prompt is added, so
+        # summaries are taken on turn boundaries right after a reply.
+        history = self.history
+        end = len(history)
+        last = end if next_prompt else end - 1  # the newest message is always kept
+        start = max(1, last + 1 - (2 * self.max_history_turns - 1))
+        # Never open the window on a reply whose prompt was dropped.
+        while start < last and history[start]["role"] != USER_ROLE:
+            start += 1
+
+        budget = sum(len(message["content"]) for message in history[start:])
+        while budget > self.max_context_chars and start < last:
+            budget -= len(history[start]["content"])
+            start += 1
+            while start < last and history[start]["role"] != USER_ROLE:
+                budget -= len(history[start]["content"])
+                start += 1
+        return start
 
 
 class ChatApp:
@@ -66,14 +160,27 @@ class ChatApp:
         plain_output: bool = False,
         session: Optional[PromptSession] = None,
         full_screen: Optional[bool] = None,
+        resume: bool = False,
+        save_history: bool = True,
     ) -> None:
         self._use_rich_rendering = not plain_output
         self.console = _create_console(plain_output)
-        self.session = session or PromptSession()
+        if session is None:
+            from prompt_toolkit import PromptSession
+
+            session = PromptSession()
+        self.session = session
         self.model_manager = ModelManager()
         self._requested_initial_model = initial_model
         self.state = ChatState()
+        # Recapping turns that leave the history window costs one extra request per
+        # turn once the window is full, so it is opt-in.
+        self._summarise_history = env_flag("CLI_GPT_SUMMARIZE_HISTORY")
         self.command_processor = CommandProcessor(self.model_manager)
+        self._response_cache = ResponseCache()
+        self._semantic_cache: Optional[SemanticCache] = None
+        self._semantic_cache_loaded = False
+        self._models_popup: Optional[Callable[[Sequence[str], str], Optional[str]]] = None
         self._startup_messages: List[Tuple[str, str]] = []
         if full_screen is None:
             self._full_screen = self._use_rich_rendering and self.console.is_terminal
@@ -81,9 +188,37 @@ class ChatApp:
             self._full_screen = full_screen and self.console.is_terminal
         self._configure_session()
         self.client = self._init_client(api_key=api_key, timeout=timeout)
-        self._refresh_models_from_api()
+        # Network I/O runs on a background event loop so one pooled async client (and its
+        # warm connections) serves every turn while the UI thread keeps rendering.
+        self._io = BackgroundLoop()
+        self._store: Optional[StateStore] = None
+        self._session_id: Optional[int] = None
+        # The loop thread (and, below, the database) already exist, so a failure or
+        # Ctrl+C during the rest of startup must release them before propagating.
+        try:
+            # Startup network work (catalogue fetch, embedding warm-up) begins at once so it
+            # overlaps with opening the local database below.
+            startup_fetch = self._io.submit(self._fetch_models(refresh=False, startup=True))
+            # History and replies persist in SQLite so cache hits (and, with --resume, the
+            # conversation itself) survive restarts. The session row is created lazily.
+            # --no-save or CLI_GPT_NO_SAVE=1 keeps everything in memory instead.
+            save_history = save_history and not env_flag("CLI_GPT_NO_SAVE")
+            self._store = self._open_store() if save_history else None
+            if resume and not save_history:
+                self._queue_startup_message(
+                    "[bold yellow]Notice:[/bold yellow] Saving is disabled, so nothing is resumed.",
+                    "Notice: Saving is disabled, so nothing is resumed.",
+                )
+            elif resume:
+                self._resume_latest_session()
+            self._refresh_models_from_api(pending=startup_fetch)
+        except BaseException:
+            self.close()
+            raise
 
-    def _init_client(self, *, api_key: Optional[str], timeout: Optional[int]) -> OpenRouterClient:
+    def _init_client(
+        self, *, api_key: Optional[str], timeout: Optional[int]
+    ) -> AsyncOpenRouterClient:
         if timeout is not None and timeout <= 0:
             raise ValueError("Request timeout must be greater than zero seconds.")
         try:
@@ -93,11 +228,109 @@ class ChatApp:
             raise
 
         if timeout is None:
-            return OpenRouterClient(api_key=resolved_key)
-        return OpenRouterClient(api_key=resolved_key, timeout=timeout)
+            return AsyncOpenRouterClient(api_key=resolved_key)
+        return AsyncOpenRouterClient(api_key=resolved_key, timeout=timeout)
+
+    def close(self) -> None:
+        """Release pooled connections and stop the background event loop."""
+        if self._io.loop.is_closed():
+            return
+        try:
+            self._io.run(self.client.aclose())
+        finally:
+            self._io.close()
+            if self._store is not None:
+                self._store.close()
+
+    def _open_store(self) -> Optional[StateStore]:
+        try:
+            return StateStore()
+        except (OSError, sqlite3.Error) as exc:
+            self._queue_startup_message(
+                "[bold yellow]Warning:[/bold yellow] Chat history will not be saved "
+                "(state database unavailable).",
+                f"Warning: Chat history will not be saved (state database unavailable): {exc}",
+            )
+            return None
+
+    def _resume_latest_session(self) -> None:
+        store = self._store
+        if store is None:
+            return
+        try:
+            session_id = store.latest_session()
+            restored = store.load_messages(session_id) if session_id is not None else []
+        except sqlite3.Error as exc:
+            self._disable_store(exc)
+            return
+        if not restored:
+            self._queue_startup_message(
+                "[bold yellow]Notice:[/bold yellow] No previous conversation to resume.",
+                "Notice: No previous conversation to resume.",
+            )
+            return
+        self.state.history.extend(restored)
+        self._session_id = session_id
+        self._queue_startup_message(
+            f"[bold cyan]Resumed[/bold cyan] previous conversation ({len(restored)} messages). "
+            "Type /new to start over.",
+            f"Resumed previous conversation ({len(restored)} messages). Type /new to start over.",
+        )
+
+    def _persist_message(self) -> None:
+        store = self._store
+        if store is None:
+            return
+        message = self.state.history[-1]
+        try:
+            if self._session_id is None:
+                self._session_id = store.new_session()
+            store.append_message(
+                self._session_id, len(self.state.history) - 1, message["role"], message["content"]
+            )
+        except sqlite3.Error as exc:
+            self._disable_store(exc)
+
+    def _stored_response(self, cache_key: str) -> Optional[str]:
+        if self._store is None:
+            return None
+        try:
+            response_text = self._store.get_response(cache_key)
+        except sqlite3.Error as exc:
+            self._disable_store(exc)
+            return None
+        if response_text is not None:
+            self._response_cache.put(cache_key, response_text)
+        return response_text
+
+    def _store_response(self, cache_key: str, model: str, response_text: str) -> None:
+        if self._store is None:
+            return
+        try:
+            self._store.put_response(cache_key, model, response_text)
+        except sqlite3.Error as exc:
+            self._disable_store(exc)
+
+    def _disable_store(self, exc: Exception) -> None:
+        # Persistence is best effort: keep chatting in memory after a database failure.
+        store, self._store = self._store, None
+        if store is not None:
+            store.close()
+        self._print_markup(
+            "[bold yellow]Warning:[/bold yellow] Chat history is no longer being saved.",
+            f"Warning: Chat history is no longer being saved: {exc}",
+        )
 
     def run(self) -> None:
-        with patch_stdout(raw=True):
+        # patch_stdout only matters when output can land underneath a live prompt; in
+        # plain or piped sessions it would just intercept every write.
+        if self._full_screen:
+            from prompt_toolkit.patch_stdout import patch_stdout
+
+            output_guard = patch_stdout(raw=True)
+        else:
+            output_guard = nullcontext()
+        with output_guard:
             self._print_welcome()
             self._print_status("Ready")
             self._flush_startup_messages()
@@ -121,60 +354,134 @@ class ChatApp:
                 command_result = self.command_processor.process(stripped)
                 if command_result.handled:
                     if command_result.show_models:
-                        self._show_models_popup()
+                        self._show_models_popup(refresh=command_result.refresh_models)
+                    if command_result.uncached_prompt:
+                        self._handle_user_message(command_result.uncached_prompt, use_cache=False)
                     if command_result.message:
                         self._print_info_message(command_result.message)
                     if command_result.clear_history:
                         self.state.reset()
+                        self._session_id = None
                     if command_result.exit:
                         break
-                    if stripped.startswith("/switch") or stripped.startswith("/model"):
+                    if stripped.startswith(("/switch", "/model")):
                         self._print_status("Ready")
                     continue
 
                 self._handle_user_message(stripped)
 
-    def _handle_user_message(self, content: str) -> None:
+    def _handle_user_message(self, content: str, *, use_cache: bool = True) -> None:
         self.state.add_user_message(content)
+        self._persist_message()
         self._print_user_message(content)
-        try:
-            with self._typing_indicator():
-                response_text = self.client.chat_completion(
-                    self.state.messages(), model=self.model_manager.current_model
+        messages = self.state.messages()
+        model = self.model_manager.current_model
+
+        # Identical conversations on the same model are answered from memory.
+        cache_key = response_cache_key(messages, model) if use_cache else None
+        response_text = self._response_cache.get(cache_key) if cache_key else None
+        if response_text is None and cache_key:
+            response_text = self._stored_response(cache_key)
+        # Paraphrases are only matched for opening prompts: later turns depend on context
+        # the embedding of a single message cannot capture.
+        semantic_cache = self._get_semantic_cache() if use_cache and len(messages) <= 2 else None
+        if response_text is None and semantic_cache is not None:
+            response_text = self._semantic_lookup(semantic_cache, content, model)
+        if response_text is not None:
+            self._print_ai_message(response_text)
+        else:
+            try:
+                stream = self._io.iterate(self.client.stream_chat_completion(messages, model=model))
+                with self._typing_indicator():
+                    first_chunk = next(stream, "")
+                response_text = self._render_ai_stream(first_chunk, stream)
+            except KeyboardInterrupt:
+                self._print_markup(
+                    "[bold yellow]Response cancelled.[/bold yellow]",
+                    "Response cancelled.",
                 )
-        except MissingAPIKeyError as exc:  # pragma: no cover - indicates configuration drift.
-            self._print_markup(f"[bold red]{exc}[/bold red]", f"Error: {exc}")
-            raise
-        except Exception as exc:  # pragma: no cover - runtime errors
-            self._print_markup(f"[bold red]Error:[/bold red] {exc}", f"Error: {exc}")
-            return
+                return
+            except MissingAPIKeyError as exc:  # pragma: no cover - indicates configuration drift.
+                self._print_markup(f"[bold red]{exc}[/bold red]", f"Error: {exc}")
+                raise
+            except Exception as exc:  # pragma: no cover - runtime errors
+                self._print_markup(f"[bold red]Error:[/bold red] {exc}", f"Error: {exc}")
+                return
+            # Free models sometimes answer with nothing under load; never replay that.
+            if response_text.strip():
+                if cache_key:
+                    self._response_cache.put(cache_key, response_text)
+                    self._store_response(cache_key, model, response_text)
+                if semantic_cache is not None:
+                    self._semantic_store(semantic_cache, content, model, response_text)
 
         self.state.add_ai_message(response_text)
-        self._print_ai_message(response_text)
+        self._persist_message()
+        if self._summarise_history:
+            self._summarise_dropped_history(model)
         if response_text.strip() == "I need to check the web for this.":
             follow_up = "Web search not implemented in free mode."
             if self._use_rich_rendering:
                 self.console.print(f"[italic cyan]{follow_up}[/italic cyan]")
             else:
-                self.console.print(follow_up)
+                self._write_plain(follow_up)
 
-    def _print_banner(self) -> None:
-        if not self._use_rich_rendering:
-            self.console.print("cli-gpt | OpenRouter free models")
+    def _summarise_dropped_history(self, model: str) -> None:
+        dropped = self.state.unsummarised_messages()
+        if not dropped:
+            return
+        lines = [f"Earlier summary: {self.state.summary}"] if self.state.summary else []
+        lines.extend(f"{message['role'].title()}: {message['content']}" for message in dropped)
+        prompt = [
+            {"role": SYSTEM_ROLE, "content": SUMMARY_PROMPT},
+            {"role": USER_ROLE, "content": "\n".join(lines)},
+        ]
+        try:
+            summary = self._io.run(self.client.chat_completion(prompt, model=model))
+        except Exception as exc:  # pragma: no cover - runtime errors
+            # The dropped turns stay pending and are retried after the next reply.
+            self._print_markup(
+                f"[bold yellow]Notice:[/bold yellow] Could not summarise earlier messages ({exc}).",
+                f"Notice: Could not summarise earlier messages ({exc}).",
+            )
             return
+        if summary.strip():
+            self.state.apply_summary(summary.strip())
+
+    def _get_semantic_cache(self) -> Optional[SemanticCache]:
+        if not self._semantic_cache_loaded:
+            self._semantic_cache_loaded = True
+            self._semantic_cache = semantic_cache_from_env()
+        return self._semantic_cache
 
-        panel = Panel(
-            "[bold cyan]cli-gpt[/bold cyan]  [dim]OpenRouter free models[/dim]\n"
-            "[dim]Commands:[/dim] /list  /model  /clear  /help  /quit",
-            box=box.HEAVY,
-            padding=(1, 2),
-            border_style="cyan",
+    def _semantic_lookup(self, cache: SemanticCache, prompt: str, model: str) -> Optional[str]:
+        try:
+            return cache.lookup(prompt, model)
+        except Exception as exc:  # pragma: no cover - embedding server unavailable
+            self._disable_semantic_cache(exc)
+            return None
+
+    def _semantic_store(self, cache: SemanticCache, prompt: str, model: str, response: str) -> None:
+        if self._semantic_cache is not cache:
+            return
+        try:
+            cache.store(prompt, model, response)
+        except Exception as exc:  # pragma: no cover - embedding server unavailable
+            self._disable_semantic_cache(exc)
+
+    def _disable_semantic_cache(self, exc: Exception) -> None:
+        # Best effort only: stop embedding for the rest of the session after a failure.
+        self._semantic_cache = None
+        self._print_markup(
+            "[bold yellow]Warning:[/bold yellow] Semantic cache disabled (embedding failed).",
+            f"Warning: Semantic cache disabled (embedding failed): {exc}",
         )
-        self.console.print(panel)
 
     def _print_status(self, status: str) -> None:
         model = self.model_manager.current_model
         if self._use_rich_rendering:
+            from rich.panel import Panel
+
             panel = Panel.fit(
                 f"[bold #6ee7ff]Model[/bold #6ee7ff]: {model}\n"
                 f"[bold #34d399]Status[/bold #34d399]: {status}",
@@ -184,11 +491,13 @@ class ChatApp:
             )
             self.console.print(panel)
         else:
-            self.console.print(f"Model: {model} | Status: {status}")
+            self._write_plain(f"Model: {model} | Status: {status}")
 
     def _print_user_message(self, content: str) -> None:
         timestamp = _timestamp()
         if self._use_rich_rendering:
+            from rich.panel import Panel
+
             self.console.print(
                 Panel(
                     content,
@@ -199,25 +508,70 @@ class ChatApp:
                 )
             )
         else:
-            self.console.print(f"[{timestamp}] You: {content}")
+            self._write_plain(f"[{timestamp}] You: {content}")
+
+    def _render_ai_stream(self, first_chunk: str, stream: Iterator[str]) -> str:
+        """Show the reply as it streams in and return the full text."""
+        chunks = [first_chunk]
+        if not self._use_rich_rendering:
+            # Tokens go straight to the console's file: even Console.out renders segments,
+            # which adds up at one call per token.
+            file = self.console.file
+            file.write(f"[{_timestamp()}] AI: {first_chunk}")
+            file.flush()
+            try:
+                for chunk in stream:
+                    chunks.append(chunk)
+                    file.write(chunk)
+                    file.flush()
+            finally:
+                # End the line even when the stream fails, so errors start on their own.
+                file.write("\n")
+            return "".join(chunks)
+
+        # The transient live panel grows with each chunk as plain text; the final panel
+        # is rendered once as Markdown and printed normally so long replies are not
+        # cropped to the terminal height.
+        from rich.live import Live
+        from rich.text import Text
+
+        preview = Text(first_chunk)
+        with Live(
+            self._ai_panel(preview),
+            console=self.console,
+            transient=True,
+            refresh_per_second=12,
+        ):
+            for chunk in stream:
+                chunks.append(chunk)
+                preview.append(chunk)
+        response_text = "".join(chunks)
+        self._print_ai_message(response_text)
+        return response_text
 
     def _print_ai_message(self, content: str) -> None:
-        timestamp = _timestamp()
         if self._use_rich_rendering:
-            self.console.print(
-                Panel(
-                    content,
-                    title="Assistant",
-                    subtitle=f"{timestamp}",
-                    border_style="#14b8a6",
-                    padding=(0, 1),
-                )
-            )
+            from rich.markdown import Markdown
+
+            self.console.print(self._ai_panel(Markdown(content)))
         else:
-            self.console.print(f"[{timestamp}] AI: {content}")
+            self._write_plain(f"[{_timestamp()}] AI: {content}")
+
+    def _ai_panel(self, content: Any) -> Panel:
+        from rich.panel import Panel
+
+        return Panel(
+            content,
+            title="Assistant",
+            subtitle=f"{_timestamp()}",
+            border_style="#14b8a6",
+            padding=(0, 1),
+        )
 
     def _print_info_message(self, message: str) -> None:
         if self._use_rich_rendering:
+            from rich.panel import Panel
+
             self.console.print(
                 Panel(
                     message,
@@ -227,15 +581,25 @@ class ChatApp:
                 )
             )
         else:
-            self.console.print(message)
+            self._write_plain(message)
 
     def _print_markup(self, rich_text: str, plain_text: str) -> None:
         if self._use_rich_rendering:
             self.console.print(rich_text)
         else:
-            self.console.print(plain_text)
+            self._write_plain(plain_text)
 
-    def _refresh_models_from_api(self, *, notify: bool = False) -> None:
+    def _write_plain(self, text: str) -> None:
+        # Plain output has no markup or wrapping to apply, so skip rich's render pipeline.
+        self.console.file.write(f"{text}\n")
+
+    def _refresh_models_from_api(
+        self,
+        *,
+        notify: bool = False,
+        refresh: bool = False,
+        pending: Optional[Future[Tuple[List[str], Optional[BaseException]]]] = None,
+    ) -> None:
         def emit_message(rich_text: str, plain_text: str) -> None:
             if notify:
                 self._print_markup(rich_text, plain_text)
@@ -243,7 +607,9 @@ class ChatApp:
                 self._queue_startup_message(rich_text, plain_text)
 
         try:
-            models = self.client.list_models(free_only=True)
+            if pending is None:
+                pending = self._io.submit(self._fetch_models(refresh=refresh, startup=not notify))
+            models, warm_up_error = self._io.wait(pending)
         except Exception as exc:  # pragma: no cover - runtime errors
             emit_message(
                 "[bold yellow]Warning:[/bold yellow] Could not refresh free model catalogue.",
@@ -252,6 +618,13 @@ class ChatApp:
             self._apply_requested_initial_model(emit_message)
             return
 
+        if warm_up_error is not None:
+            self._semantic_cache = None
+            emit_message(
+                "[bold yellow]Warning:[/bold yellow] Semantic cache disabled (embedding failed).",
+                f"Warning: Semantic cache disabled (embedding failed): {warm_up_error}",
+            )
+
         if not models:
             emit_message(
                 "[bold yellow]Warning:[/bold yellow] OpenRouter did not return any free models.",
@@ -277,6 +650,36 @@ class ChatApp:
                 ),
             )
 
+    async def _fetch_models(
+        self, *, refresh: bool, startup: bool
+    ) -> Tuple[List[str], Optional[BaseException]]:
+        """Fetch the catalogue, warming the embedding model concurrently at startup."""
+        import asyncio
+
+        semantic_cache = self._get_semantic_cache() if startup else None
+        if semantic_cache is None:
+            return await self._list_models(refresh=refresh, startup=startup), None
+
+        models, warm_up_result = await asyncio.gather(
+            self._list_models(refresh=refresh, startup=startup),
+            asyncio.to_thread(semantic_cache.warm_up),
+            return_exceptions=True,
+        )
+        if isinstance(models, BaseException):
+            raise models
+        return models, warm_up_result if isinstance(warm_up_result, BaseException) else None
+
+    async def _list_models(self, *, refresh: bool, startup: bool) -> List[str]:
+        # A recent on-disk copy lets startup skip the catalogue round-trip entirely.
+        if startup and not refresh:
+            cached = load_cached_models()
+            if cached:
+                return cached
+        models = await self.client.list_models(free_only=True, use_cache=not refresh)
+        if models and (startup or refresh):
+            store_cached_models(models)
+        return models
+
     def _apply_requested_initial_model(self, emit_message) -> None:
         if not self._requested_initial_model:
             return
@@ -284,7 +687,7 @@ class ChatApp:
         requested_model = self._requested_initial_model
         self._requested_initial_model = None
 
-        if requested_model in self.model_manager.list_models():
+        if self.model_manager.is_available(requested_model):
             self.model_manager.set_model(requested_model)
             return
 
@@ -301,9 +704,12 @@ class ChatApp:
 
     def _print_welcome(self) -> None:
         if not self._use_rich_rendering:
-            self.console.print("cli-gpt — type /help for commands")
+            self._write_plain("cli-gpt — type /help for commands")
             return
 
+        from rich.panel import Panel
+        from rich.text import Text
+
         title = Text("cli-gpt", style="bold #e2e8f0")
         subtitle = Text("OpenRouter chat in your terminal", style="#94a3b8")
         commands = Text(
@@ -331,18 +737,40 @@ class ChatApp:
 
     @contextmanager
     def _typing_indicator(self):
-        message = "AI is thinking..."
-        use_status = getattr(self.console, "is_terminal", False)
-        if use_status:
-            label = f"[cyan]{message}[/cyan]" if self._use_rich_rendering else message
-            with self.console.status(label, spinner="dots"):
-                yield
-        else:
+        """Animate a one-line spinner from the I/O loop until the block exits."""
+        if not getattr(self.console, "is_terminal", False):
             yield
+            return
 
-    def _show_models_popup(self) -> None:
+        # The ticker runs as a timer on the background loop instead of a dedicated
+        # spinner thread; it only ever rewrites its own line.
+        file = self.console.file
+        loop = self._io.loop
+        handle: Optional[Any] = None
+        frame = 0
+
+        def tick() -> None:
+            nonlocal handle, frame
+            file.write(f"\r{TYPING_MESSAGE} {SPINNER_FRAMES[frame % len(SPINNER_FRAMES)]}")
+            file.flush()
+            frame += 1
+            handle = loop.call_later(SPINNER_INTERVAL, tick)
+
+        async def stop() -> None:
+            if handle is not None:
+                handle.cancel()
+            file.write("\r\x1b[2K")
+            file.flush()
+
+        loop.call_soon_threadsafe(tick)
+        try:
+            yield
+        finally:
+            self._io.run(stop())
+
+    def _show_models_popup(self, *, refresh: bool = False) -> None:
         """Render an interactive model chooser using prompt_toolkit."""
-        self._refresh_models_from_api(notify=True)
+        self._refresh_models_from_api(notify=True, refresh=refresh)
         models = self.model_manager.list_models()
         if not models:
             self._print_markup(
@@ -360,50 +788,117 @@ class ChatApp:
             self.console.print(f"Available models:\n{formatted}")
             return
 
-        current_model = self.model_manager.current_model
+        # The popup's application, layout and key bindings are built on first use and
+        # reused afterwards; each open only resets its state for the current catalogue.
+        if self._models_popup is None:
+            self._models_popup = self._build_models_popup()
+        chosen_model = self._models_popup(models, self.model_manager.current_model)
+        if chosen_model:
+            self.model_manager.set_model(chosen_model)
+            self._print_status("Ready")
+
+    def _build_models_popup(self) -> Callable[[Sequence[str], str], Optional[str]]:
+        """Construct the model chooser once and return a function that opens it."""
+        import asyncio
+
+        from prompt_toolkit.application import Application
+        from prompt_toolkit.buffer import Buffer
+        from prompt_toolkit.filters import Condition, has_focus
+        from prompt_toolkit.key_binding import KeyBindings
+        from prompt_toolkit.layout import Layout, ScrollOffsets
+        from prompt_toolkit.layout.containers import (
+            ConditionalContainer,
+            HSplit,
+            VSplit,
+            Window,
+            WindowAlign,
+        )
+        from prompt_toolkit.layout.controls import BufferControl, FormattedTextControl
+        from prompt_toolkit.layout.dimension import Dimension
+
+        # Per-open state, (re)initialised by ``open_popup``.
+        models: Sequence[str] = ()
+        current_model = ""
         filter_text = ""
         selected_index = 0
-        total_models = len(models)
-
-        if current_model in models:
-            selected_index = models.index(current_model)
+        total_models = 0
 
         # Utilities ---------------------------------------------------------
-        def filtered_models() -> List[str]:
+        # Lowercased once per catalogue; the last needle's matches are memoised because
+        # the filter is re-evaluated on every redraw, not only when the text changes.
+        lowered_models: List[str] = []
+        # Large catalogues get a trigram index so a keystroke only checks the names that
+        # share every trigram of the needle rather than scanning the whole list.
+        trigrams: Optional[Dict[str, set]] = None
+        last_needle: Optional[str] = None
+        last_matches: Sequence[str] = models
+
+        def filtered_models() -> Sequence[str]:
+            nonlocal last_needle, last_matches
             if not filter_text:
                 return models
             needle = filter_text.lower()
-            return [name for name in models if needle in name.lower()]
-
-        def move_selection(delta: int) -> None:
+            if needle != last_needle:
+                last_needle = needle
+                candidates = _trigram_candidates(trigrams, needle) if trigrams else None
+                if candidates is None:
+                    last_matches = [
+                        name for name, lowered in zip(models, lowered_models) if needle in lowered
+                    ]
+                else:
+                    last_matches = [
+                        models[idx] for idx in sorted(candidates) if needle in lowered_models[idx]
+                    ]
+            return last_matches
+
+        def move_selection(delta: int) -> bool:
+            """Move the highlight and report whether it actually changed."""
             nonlocal selected_index
             items = filtered_models()
-            if not items:
-                selected_index = 0
-                return
-            selected_index = (selected_index + delta) % len(items)
+            previous = selected_index
+            selected_index = (selected_index + delta) % len(items) if items else 0
+            return selected_index != previous
+
+        # Page size as of the last completed render, so page keys never wait on one.
+        page_size = 0
+
+        def remember_page_size(_: Application) -> None:
+            nonlocal page_size
+            info = list_window.render_info
+            if info is not None:
+                page_size = max(info.window_height - 1, 1)
 
         # Model list view ----------------------------------------------------
+        # Row fragments are built once per catalogue; a redraw only reuses them and swaps
+        # in the highlighted style for the selected row.
+        base_fragments: Dict[str, Tuple[str, str]] = {}
+        # Unchanged (filter, selection) state returns the same fragment list object.
+        last_render_key: Optional[Tuple[str, int]] = None
+        last_fragments: List[Tuple[str, str]] = []
+
         def render_model_list() -> List[Tuple[str, str]]:
+            nonlocal last_render_key, last_fragments
+            render_key = (filter_text, selected_index)
+            if render_key == last_render_key:
+                return last_fragments
+
             items = filtered_models()
             if not items:
-                return [("class:model-list.empty", " No models match your filter.\n")]
-
-            fragments: List[Tuple[str, str]] = []
-            for idx, name in enumerate(items):
-                # Optional marker for the active model.
-                display = f"{name} (current)" if name == current_model else name
-                style = "class:model-list"
-                if idx == selected_index and name == current_model:
-                    style = "class:model-list.selected-current"
-                elif idx == selected_index:
-                    style = "class:model-list.selected"
-                elif name == current_model:
-                    style = "class:model-list.current"
-                fragments.append((style, f" {display}\n"))
+                fragments = [("class:model-list.empty", " No models match your filter.\n")]
+            else:
+                fragments = [base_fragments[name] for name in items]
+                selected = items[selected_index]
+                selected_style = (
+                    "class:model-list.selected-current"
+                    if selected == current_model
+                    else "class:model-list.selected"
+                )
+                fragments[selected_index] = (selected_style, fragments[selected_index][1])
+            last_render_key = render_key
+            last_fragments = fragments
             return fragments
 
-        list_control = FormattedTextControl(render_model_list, show_cursor=False)
+        list_control = FormattedTextControl(render_model_list, focusable=True, show_cursor=False)
         list_window = Window(
             content=list_control,
             always_hide_cursor=True,
@@ -416,7 +911,6 @@ class ChatApp:
 
         # Search/filter bar --------------------------------------------------
         search_active = False
-        app: Optional[Application] = None
 
         search_buffer = Buffer()
         search_input_control = BufferControl(buffer=search_buffer, focusable=True)
@@ -470,10 +964,31 @@ class ChatApp:
                 selected_index = items.index(current_model)
             else:
                 selected_index = min(selected_index, len(items) - 1) if items else 0
-            if app is not None:
-                app.invalidate()
+            app.invalidate()
+
+        # Keystrokes are coalesced: a burst of typing re-filters and redraws once, ~30ms
+        # after the last key, instead of once per character.
+        pending_filter: Optional[asyncio.TimerHandle] = None
+
+        def schedule_filter_update(_: Buffer) -> None:
+            nonlocal pending_filter
+            if pending_filter is not None:
+                pending_filter.cancel()
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:  # pragma: no cover - text set outside the popup's loop
+                update_filter()
+                return
+            pending_filter = loop.call_later(FILTER_DEBOUNCE_SECONDS, flush_filter_update)
 
-        search_buffer.on_text_changed += lambda _: update_filter()
+        def flush_filter_update() -> None:
+            nonlocal pending_filter
+            if pending_filter is not None:
+                pending_filter.cancel()
+                pending_filter = None
+            update_filter()
+
+        search_buffer.on_text_changed += schedule_filter_update
 
         # Key bindings -------------------------------------------------------
         kb = KeyBindings()
@@ -483,29 +998,23 @@ class ChatApp:
         @kb.add("up", filter=~search_focus)
         def _(event) -> None:
             event.app.layout.focus(list_window)
-            move_selection(-1)
-            event.app.invalidate()
+            if move_selection(-1):
+                event.app.invalidate()
 
         @kb.add("down", filter=~search_focus)
         def _(event) -> None:
             event.app.layout.focus(list_window)
-            move_selection(1)
-            event.app.invalidate()
+            if move_selection(1):
+                event.app.invalidate()
 
         @kb.add("pageup", filter=~search_focus)
         def _(event) -> None:
-            window = list_window
-            info = window.render_info
-            if info:
-                move_selection(-(max(info.window_height - 1, 1)))
+            if move_selection(-(page_size or 10)):
                 event.app.invalidate()
 
         @kb.add("pagedown", filter=~search_focus)
         def _(event) -> None:
-            window = list_window
-            info = window.render_info
-            if info:
-                move_selection(max(info.window_height - 1, 1))
+            if move_selection(page_size or 10):
                 event.app.invalidate()
 
         @kb.add("/")
@@ -520,6 +1029,7 @@ class ChatApp:
         @kb.add("enter", filter=has_focus(search_input_window))
         def _(event) -> None:
             nonlocal search_active
+            flush_filter_update()
             search_active = False
             event.app.layout.focus(list_window)
             event.app.invalidate()
@@ -527,6 +1037,7 @@ class ChatApp:
         @kb.add("escape", filter=has_focus(search_input_window))
         def _(event) -> None:
             nonlocal search_active
+            flush_filter_update()
             search_active = False
             event.app.layout.focus(list_window)
             event.app.invalidate()
@@ -557,37 +1068,112 @@ class ChatApp:
             padding=1,
         )
 
-        style = Style.from_dict(
-            {
-                "title": "bold fg:#00bcd4",
-                "model-list": "",
-                "model-list-container": "bg:#0f172a",
-                "model-list.current": "fg:#22d3ee",
-                "model-list.selected": "bg:#1e293b",
-                "model-list.selected-current": "bg:#1e293b fg:#22d3ee",
-                "model-list.empty": "italic #94a3b8",
-                "search.prompt": "fg:#94a3b8",
-                "search.input": "",
-                "footer": "fg:#94a3b8",
-            }
-        )
-
-        app: Optional[Application] = Application(
+        app: Application = Application(
             layout=Layout(container, focused_element=list_window),
             key_bindings=kb,
             full_screen=True,
-            style=style,
+            style=_models_popup_style(),
+            after_render=remember_page_size,
         )
 
-        # Run the popup and react to the result.
-        chosen_model = app.run()
-        if chosen_model:
-            self.model_manager.set_model(chosen_model)
-            self._print_status("Ready")
+        def open_popup(catalogue: Sequence[str], active_model: str) -> Optional[str]:
+            nonlocal models, current_model, total_models, lowered_models, trigrams
+            nonlocal base_fragments, filter_text, selected_index, search_active
+            nonlocal last_needle, last_matches, last_render_key, pending_filter
+            if catalogue is not models:
+                models = catalogue
+                total_models = len(models)
+                lowered_models = [name.lower() for name in models]
+                trigrams = None
+                if total_models > TRIGRAM_INDEX_MIN_MODELS:
+                    trigrams = _trigram_index(lowered_models)
+                base_fragments = {}
+            if not base_fragments or active_model != current_model:
+                current_model = active_model
+                base_fragments = {
+                    name: (
+                        ("class:model-list.current", f" {name} (current)\n")
+                        if name == current_model
+                        else ("class:model-list", f" {name}\n")
+                    )
+                    for name in models
+                }
+
+            if pending_filter is not None:
+                pending_filter.cancel()
+                pending_filter = None
+            search_buffer.reset()
+            filter_text = ""
+            search_active = False
+            selected_index = models.index(current_model) if current_model in models else 0
+            last_needle = None
+            last_matches = models
+            last_render_key = None
+            app.layout.focus(list_window)
+
+            # Run the popup and react to the result.
+            return app.run()
+
+        return open_popup
+
+
+@lru_cache(maxsize=1)
+def _models_popup_style() -> Style:
+    from prompt_toolkit.styles import Style
+
+    return Style.from_dict(
+        {
+            "title": "bold fg:#00bcd4",
+            "model-list": "",
+            "model-list-container": "bg:#0f172a",
+            "model-list.current": "fg:#22d3ee",
+            "model-list.selected": "bg:#1e293b",
+            "model-list.selected-current": "bg:#1e293b fg:#22d3ee",
+            "model-list.empty": "italic #94a3b8",
+            "search.prompt": "fg:#94a3b8",
+            "search.input": "",
+            "footer": "fg:#94a3b8",
+        }
+    )
+
+
+def _trigram_index(names: Sequence[str]) -> Dict[str, set]:
+    """Map every three-character substring to the indices of the names containing it."""
+    index: Dict[str, set] = {}
+    for idx, name in enumerate(names):
+        for pos in range(len(name) - 2):
+            index.setdefault(name[pos : pos + 3], set()).add(idx)
+    return index
 
 
-def _timestamp() -> str:
-    return datetime.now().strftime("%H:%M")
+def _trigram_candidates(index: Dict[str, set], needle: str) -> Optional[set]:
+    """Return indices that may contain ``needle``, or ``None`` if it is too short to narrow."""
+    if len(needle) < 3:
+        return None
+    postings = sorted(
+        (index.get(needle[pos : pos + 3], set()) for pos in range(len(needle) - 2)), key=len
+    )
+    return postings[0].intersection(*postings[1:])
+
+
+def _make_timestamp() -> Callable[[], str]:
+    # Labels only show hours and minutes, so format once per wall-clock minute.
+    last_minute = -1
+    last_label = ""
+
+    def timestamp() -> str:
+        nonlocal last_minute, last_label
+        now = time.time()
+        minute = int(now // 60)
+        if minute != last_minute:
+            last_minute = minute
+            last_label = time.strftime("%H:%M", time.localtime(now))
+        return last_label
+
+    return timestamp
+
+
+_timestamp = _make_timestamp()
 
 
 def run_cli(
@@ -597,7 +1183,11 @@ def run_cli(
     timeout: Optional[int] = None,
     plain_output: bool = False,
     full_screen: Optional[bool] = None,
+    resume: bool = False,
+    save_history: bool = True,
 ) -> int:
+    from dotenv import load_dotenv
+
     # Allow configuring OPENROUTER_API_KEY (and other settings) via a local .env file.
     load_dotenv()
     try:
@@ -607,16 +1197,23 @@ def run_cli(
             timeout=timeout,
             plain_output=plain_output,
             full_screen=full_screen,
+            resume=resume,
+            save_history=save_history,
         )
     except (MissingAPIKeyError, ValueError) as exc:
         _print_startup_error(str(exc), plain_output)
         return 1
+    except KeyboardInterrupt:
+        # Ctrl+C while connecting; ChatApp has already released what it started.
+        return 130
 
     try:
         app.run()
     except MissingAPIKeyError:
         # Already surfaced to the user in context; exit with a non-zero status.
         return 1
+    finally:
+        app.close()
     return 0
 
 
@@ -629,6 +1226,8 @@ def _print_startup_error(message: str, plain_output: bool) -> None:
 
 
 def _create_console(plain_output: bool) -> Console:
+    from rich.console import Console
+
     if plain_output:
         return Console(
             markup=False,
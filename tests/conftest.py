@@ -0,0 +1,10 @@
+import pytest
+
+from cli_gpt.api import invalidate_models_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_models_cache():
+    invalidate_models_cache()
+    yield
+    invalidate_models_cache()
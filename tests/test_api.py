@@ -1,5 +1,15 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
 from cli_gpt.api import (
+    PROMPT_PREFIX_HEADER,
+    AsyncOpenRouterClient,
+    OpenRouterAPIError,
     OpenRouterClient,
+    _get_session,
     get_api_url,
     get_app_referer,
     get_app_title,
@@ -13,6 +23,7 @@ class DummyResponse:
         self.ok = ok
         self.status_code = status_code
         self.text = ""
+        self.content = json.dumps(payload).encode("utf-8")
 
     def json(self):
         return self._payload
@@ -22,12 +33,37 @@ class DummySession:
     def __init__(self, response):
         self.response = response
         self.last_get = None
+        self.get_calls = 0
 
     def get(self, url, headers, timeout):
+        self.get_calls += 1
         self.last_get = {"url": url, "headers": headers, "timeout": timeout}
         return self.response
 
 
+class StreamingResponse(DummyResponse):
+    def __init__(self, lines):
+        super().__init__(None)
+        self._lines = lines
+        self.closed = False
+
+    def iter_lines(self):
+        return iter(self._lines)
+
+    def close(self):
+        self.closed = True
+
+
+class StreamingSession:
+    def __init__(self, response):
+        self.response = response
+        self.last_post = None
+
+    def post(self, url, data, headers, timeout, stream):
+        self.last_post = {"url": url, "json": json.loads(data), "headers": headers, "stream": stream}
+        return self.response
+
+
 def test_runtime_env_configuration_is_resolved_per_call(monkeypatch):
     monkeypatch.setenv("OPENROUTER_API_URL", "https://example.test/chat")
     monkeypatch.setenv("OPENROUTER_MODELS_URL", "https://example.test/models")
@@ -77,3 +113,236 @@ def test_list_models_uses_runtime_env_values_and_filters_free_models(monkeypatch
         },
         "timeout": 45,
     }
+
+
+def test_free_filter_handles_suffix_case_numeric_prices_and_duplicates():
+    session = DummySession(
+        DummyResponse(
+            {
+                "data": [
+                    {"id": "vendor/model-a:FREE"},
+                    {"id": "vendor/model-b", "pricing": {"prompt": 0, "completion": 0.0}},
+                    {"id": "vendor/model-c", "pricing": {"prompt": " 0.000 ", "completion": "0"}},
+                    {"id": "vendor/model-d", "pricing": {"prompt": "0", "completion": "0.0001"}},
+                    {"id": "vendor/model-e", "pricing": {"prompt": "", "completion": "0"}},
+                    {"id": "vendor/model-b", "pricing": {"prompt": "1", "completion": "1"}},
+                    "not-a-dict",
+                ]
+            }
+        )
+    )
+    client = OpenRouterClient(api_key="test-key", session=session)
+
+    assert client.list_models() == ["vendor/model-a:FREE", "vendor/model-b", "vendor/model-c"]
+
+
+def test_stream_chat_completion_yields_sse_deltas_until_done():
+    response = StreamingResponse(
+        [
+            b": OPENROUTER PROCESSING",
+            b"",
+            b'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            b'data: {"choices": [{"delta": {"content": "Hel"}}]}',
+            'data: {"choices": [{"delta": {"content": "lo \u2728"}}]}'.encode("utf-8"),
+            b"data: [DONE]",
+            b'data: {"choices": [{"delta": {"content": "ignored"}}]}',
+        ]
+    )
+    session = StreamingSession(response)
+    client = OpenRouterClient(api_key="test-key", session=session)
+    messages = [{"role": "user", "content": "hi"}]
+
+    assert list(client.stream_chat_completion(messages, model="m")) == ["Hel", "lo \u2728"]
+    assert session.last_post["json"] == {"model": "m", "messages": messages, "stream": True}
+    assert session.last_post["stream"] is True
+    assert session.last_post["headers"]["Authorization"] == "Bearer test-key"
+    assert session.last_post["headers"]["Content-Type"] == "application/json"
+    assert response.closed
+    # The header dict is built once per client and reused for every request.
+    list(client.stream_chat_completion(messages, model="m"))
+    assert session.last_post["headers"] is client._headers
+
+
+def test_prompt_prefix_header_is_opt_in_and_tracks_the_stable_prefix(monkeypatch):
+    session = StreamingSession(StreamingResponse([b"data: [DONE]"]))
+    client = OpenRouterClient(api_key="test-key", session=session)
+    system = {"role": "system", "content": "be brief"}
+    first = [system, {"role": "user", "content": "hi"}]
+    second = [system, {"role": "user", "content": "again"}]
+
+    list(client.stream_chat_completion(first, model="m"))
+    assert PROMPT_PREFIX_HEADER not in session.last_post["headers"]
+
+    monkeypatch.setenv("CLI_GPT_PROMPT_PREFIX_HEADER", "1")
+    list(client.stream_chat_completion(first, model="m"))
+    digest = session.last_post["headers"][PROMPT_PREFIX_HEADER]
+    assert session.last_post["headers"]["Authorization"] == "Bearer test-key"
+    list(client.stream_chat_completion(second, model="m"))
+    assert session.last_post["headers"][PROMPT_PREFIX_HEADER] == digest
+    list(client.stream_chat_completion(first + second[1:], model="m"))
+    assert session.last_post["headers"][PROMPT_PREFIX_HEADER] != digest
+    # The shared per-client header dict is never mutated.
+    assert PROMPT_PREFIX_HEADER not in client._headers
+
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get(PROMPT_PREFIX_HEADER))
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    async def scenario():
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = AsyncOpenRouterClient(api_key="test-key", client=http_client)
+        await client.chat_completion(first, model="m")
+        await client.chat_completion(first[1:], model="m")
+        await http_client.aclose()
+
+    asyncio.run(scenario())
+    assert seen == [digest, None]
+
+
+def test_stream_chat_completion_surfaces_in_band_errors():
+    response = StreamingResponse(
+        [
+            b'data: {"choices": [{"delta": {"content": "partial"}}]}',
+            b'data: {"error": {"code": 502, "message": "provider went away"}}',
+        ]
+    )
+    client = OpenRouterClient(api_key="test-key", session=StreamingSession(response))
+
+    with pytest.raises(OpenRouterAPIError, match="provider went away"):
+        client.chat_completion([{"role": "user", "content": "hi"}], model="m")
+    assert response.closed
+
+
+def test_list_models_is_memoised_until_refresh_requested():
+    session = DummySession(DummyResponse({"data": [{"id": "free/model-one:free"}]}))
+    client = OpenRouterClient(api_key="test-key", session=session)
+
+    assert client.list_models() == ["free/model-one:free"]
+    assert client.list_models() == ["free/model-one:free"]
+    assert session.get_calls == 1
+
+    assert client.list_models(use_cache=False) == ["free/model-one:free"]
+    assert session.get_calls == 2
+
+
+def test_clients_share_a_pooled_session_per_api_key():
+    first = OpenRouterClient(api_key="pooled-key")
+    second = OpenRouterClient(api_key="pooled-key")
+    other = OpenRouterClient(api_key="other-key")
+
+    assert first.session is second.session is _get_session("pooled-key")
+    assert other.session is not first.session
+    adapter = first.session.get_adapter("https://openrouter.ai")
+    assert adapter.max_retries.total == 4
+    assert 429 in adapter.max_retries.status_forcelist
+    assert "POST" in adapter.max_retries.allowed_methods
+
+
+def test_async_client_chat_completion_and_models_share_one_http_client(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_URL", "https://example.test/chat")
+    monkeypatch.setenv("OPENROUTER_MODELS_URL", "https://example.test/models")
+    seen = []
+
+    def handler(request):
+        seen.append((request.method, str(request.url), request.headers.get("Authorization")))
+        assert request.headers["X-Title"] == get_app_title()
+        if request.method == "POST":
+            return httpx.Response(200, json={"choices": [{"message": {"content": "hi there"}}]})
+        return httpx.Response(
+            200,
+            json={"data": [{"id": "free/model-one:free"}, {"id": "paid/model-two"}]},
+        )
+
+    async def scenario():
+        transport = httpx.MockTransport(handler)
+        # The injected client carries no credentials; they must come from ``api_key``.
+        http_client = httpx.AsyncClient(transport=transport)
+        async with AsyncOpenRouterClient(api_key="test-key", client=http_client) as client:
+            reply, models = await asyncio.gather(
+                client.chat_completion([{"role": "user", "content": "hello"}], model="m"),
+                client.list_models(),
+            )
+        await http_client.aclose()
+        return reply, models
+
+    reply, models = asyncio.run(scenario())
+
+    assert reply == "hi there"
+    assert models == ["free/model-one:free"]
+    assert sorted(seen) == [
+        ("GET", "https://example.test/models", "Bearer test-key"),
+        ("POST", "https://example.test/chat", "Bearer test-key"),
+    ]
+
+
+def test_chat_completion_many_bounds_concurrency_and_retries_transient_errors():
+    state = {"in_flight": 0, "peak": 0, "throttled": 0}
+
+    async def handler(request):
+        if state["throttled"] < 2:
+            state["throttled"] += 1
+            status = 429 if state["throttled"] == 1 else 503
+            return httpx.Response(status, headers={"Retry-After": "0"}, json={"message": "busy"})
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        prompt = json.loads(request.content)["messages"][0]["content"]
+        if prompt == "boom":
+            return httpx.Response(400, json={"error": {"message": "bad request"}})
+        return httpx.Response(200, json={"choices": [{"message": {"content": prompt.upper()}}]})
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = AsyncOpenRouterClient(api_key="test-key", client=http_client)
+    jobs = [([{"role": "user", "content": text}], "m") for text in ["a", "b", "boom", "c", "d"]]
+
+    results = client.chat_completion_many_sync(jobs, concurrency=2)
+
+    assert results[:2] == ["A", "B"]
+    assert isinstance(results[2], OpenRouterAPIError)
+    assert results[2].status_code == 400
+    assert results[3:] == ["C", "D"]
+    assert state["peak"] == 2
+
+
+def test_owned_async_client_is_built_once_and_released_on_close(monkeypatch):
+    import cli_gpt.api as api
+
+    monkeypatch.setattr(api, "_http2_available", lambda: False)
+    client = AsyncOpenRouterClient(api_key="test-key", timeout=12)
+
+    http_client = client._ensure_client()
+
+    assert client._ensure_client() is http_client
+    assert http_client.timeout.read == 12
+    assert http_client.headers["Authorization"] == "Bearer test-key"
+    asyncio.run(client.aclose())
+    assert client.client is None
+
+
+def test_async_stream_chat_completion_yields_sse_deltas():
+    body = (
+        ": keep-alive\n\n"
+        'data: {"choices": [{"delta": {"content": "Hel"}}]}\n\n'
+        'data: {"choices": [{"delta": {"content": "lo"}}]}\r\n\r\n'
+        # JSON allows raw line/paragraph separators inside strings; they must not split.
+        'data: {"choices": [{"delta": {"content": "a\u2028b\u0085c"}}]}\n\n'
+        "data: [DONE]\n\n"
+    ).encode("utf-8")
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(json.loads(request.content))
+        return httpx.Response(200, content=body, headers={"Content-Type": "text/event-stream"})
+
+    async def scenario():
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = AsyncOpenRouterClient(api_key="test-key", client=http_client)
+        chunks = [chunk async for chunk in client.stream_chat_completion([], model="m")]
+        await http_client.aclose()
+        return chunks
+
+    assert asyncio.run(scenario()) == ["Hel", "lo", "a\u2028b\u0085c"]
+    assert requests_seen == [{"model": "m", "messages": [], "stream": True}]
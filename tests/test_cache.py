@@ -0,0 +1,133 @@
+import os
+import time
+from types import MappingProxyType
+
+import pytest
+
+from cli_gpt.cache import (
+    ResponseCache,
+    SemanticCache,
+    load_cached_models,
+    response_cache_key,
+    store_cached_models,
+)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_response_cache_key_is_stable_and_sensitive_to_model_and_history(monkeypatch, use_orjson):
+    from cli_gpt import api
+
+    if not use_orjson:
+        monkeypatch.setattr(api, "orjson", None)
+    elif api.orjson is None:
+        pytest.skip("orjson is not installed")
+    history = [{"role": "system", "content": "sys"}, {"role": "user", "content": "hi"}]
+    reordered = [{"content": "sys", "role": "system"}, {"content": "hi", "role": "user"}]
+
+    assert response_cache_key(history, "m") == response_cache_key(reordered, "m")
+    assert response_cache_key(history, "m") != response_cache_key(history, "other")
+    assert response_cache_key(history, "m") != response_cache_key(history[:1], "m")
+    # Read-only mappings (the shared system prompt) hash like the equivalent dict.
+    frozen = [MappingProxyType(history[0]), history[1]]
+    assert response_cache_key(frozen, "m") == response_cache_key(history, "m")
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(maxsize=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert len(cache) == 2
+
+
+def test_semantic_cache_matches_paraphrases_per_model():
+    vectors = {
+        "explain recursion": [1.0, 0.0, 0.1],
+        "tell me about recursion": [0.98, 0.0, 0.12],
+        "weather today": [0.0, 1.0, 0.0],
+    }
+    embedded = []
+
+    def embed(text):
+        embedded.append(text)
+        return vectors[text]
+
+    cache = SemanticCache(embed)
+    assert cache.lookup("explain recursion", "m") is None
+    cache.store("explain recursion", "m", "It calls itself.")
+
+    assert cache.lookup("tell me about recursion", "m") == "It calls itself."
+    assert cache.lookup("tell me about recursion", "other-model") is None
+    assert cache.lookup("weather today", "m") is None
+    # lookup() + store() of the same prompt only embeds it once.
+    assert embedded.count("explain recursion") == 1
+
+
+def test_semantic_cache_expires_entries(monkeypatch):
+    import cli_gpt.cache as cache_module
+
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = SemanticCache(lambda text: [1.0, 0.0], ttl=10)
+    cache.store("hi", "m", "hello")
+
+    assert cache.lookup("hi", "m") == "hello"
+    now[0] += 11
+    assert cache.lookup("hi", "m") is None
+
+
+@pytest.mark.parametrize("with_numpy", [True, False], ids=["numpy", "pure-python"])
+def test_semantic_cache_keeps_vectors_in_step_with_entries(monkeypatch, with_numpy):
+    import cli_gpt.cache as cache_module
+
+    if with_numpy:
+        np = pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(cache_module, "_numpy", lambda: None)
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    vectors = {"a": [1.0, 0.0, 0.0], "b": [0.0, 1.0, 0.0], "c": [0.0, 0.0, 1.0]}
+    cache = SemanticCache(vectors.__getitem__, ttl=10, maxsize=2)
+    cache.store("a", "m", "reply a")
+    now[0] += 6
+    cache.store("b", "m", "reply b")
+    cache.store("c", "m", "reply c")  # evicts "a" (maxsize)
+
+    assert cache.lookup("a", "m") is None
+    assert cache.lookup("b", "m") == "reply b"
+    now[0] += 5  # nothing has expired yet
+    assert cache.lookup("c", "m") == "reply c"
+    if with_numpy:
+        matrix = cache._matrices["m"]
+        assert isinstance(matrix, np.ndarray) and matrix.shape == (2, 3)
+    now[0] += 10
+    assert cache.lookup("b", "m") is None
+    if with_numpy:
+        assert cache._matrices["m"].shape == (0, 3)
+
+
+def test_model_catalogue_round_trips_through_disk_until_stale(tmp_path, monkeypatch):
+    monkeypatch.setenv("CLI_GPT_CACHE_DIR", str(tmp_path / "cache"))
+    assert load_cached_models() is None
+
+    store_cached_models(["live/a:free", "live/b:free"])
+
+    assert load_cached_models() == ["live/a:free", "live/b:free"]
+    stale = time.time() - 3600
+    os.utime(tmp_path / "cache" / "models.json", (stale, stale))
+    assert load_cached_models() is None
+
+
+def test_model_catalogue_on_disk_is_scoped_to_models_url(tmp_path, monkeypatch):
+    monkeypatch.setenv("CLI_GPT_CACHE_DIR", str(tmp_path))
+    store_cached_models(["live/a:free"])
+
+    monkeypatch.setenv("OPENROUTER_MODELS_URL", "https://example.test/models")
+
+    assert load_cached_models() is None
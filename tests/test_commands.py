@@ -0,0 +1,33 @@
+from cli_gpt.commands import HELP_TEXT, CommandProcessor
+from cli_gpt.models import ModelManager
+
+
+def make_processor():
+    manager = ModelManager()
+    manager.replace_models(["live/a", "live/b"])
+    return CommandProcessor(manager)
+
+
+def test_aliases_dispatch_to_the_same_handler():
+    processor = make_processor()
+
+    assert processor.process("/quit").exit
+    assert processor.process("/EXIT").exit
+    assert processor.process("/new").clear_history
+    assert processor.process("/clear").clear_history
+    assert processor.process("/help").message == HELP_TEXT
+    assert processor.process("/list --refresh").refresh_models
+    # Constant results are shared singletons rather than rebuilt per call.
+    assert processor.process("/quit") is processor.process("/exit")
+
+
+def test_switch_and_unknown_commands():
+    processor = make_processor()
+
+    assert processor.process("/switch").show_models
+    assert processor.process("/model live/b").message == "Switched model to live/b"
+    assert processor.model_manager.current_model == "live/b"
+    assert processor.process("/nocache  tell me again ").uncached_prompt == "tell me again"
+    assert processor.process("/nocache").message == "Usage: /nocache <prompt>"
+    assert processor.process("/bogus").message == "Unknown command: /bogus. Type /help."
+    assert not processor.process("hello").handled
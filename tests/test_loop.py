@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from cli_gpt._loop import BackgroundLoop
+
+
+@pytest.fixture
+def background_loop():
+    loop = BackgroundLoop()
+    yield loop
+    loop.close()
+
+
+async def numbers(limit):
+    for value in range(limit):
+        await asyncio.sleep(0)
+        yield value
+
+
+async def failing():
+    yield "partial"
+    raise ValueError("stream broke")
+
+
+def test_run_returns_coroutine_result(background_loop):
+    assert background_loop.run(asyncio.sleep(0, result="done")) == "done"
+
+
+def test_iterate_bridges_async_generators_and_errors(background_loop):
+    assert list(background_loop.iterate(numbers(3))) == [0, 1, 2]
+
+    stream = background_loop.iterate(failing())
+    assert next(stream) == "partial"
+    with pytest.raises(ValueError, match="stream broke"):
+        next(stream)
+
+
+def test_close_cancels_abandoned_streams():
+    loop = BackgroundLoop()
+    stream = loop.iterate(numbers(1000))
+    next(stream)
+    stream.close()
+
+    loop.close()
+    loop.close()
+
+    assert loop.loop.is_closed()
@@ -1,3 +1,8 @@
+import subprocess
+import sys
+
+import pytest
+
 from cli_gpt import __main__ as cli_main
 from cli_gpt.models import FREE_MODELS
 
@@ -34,3 +39,38 @@ def test_list_models_uses_live_catalog_when_api_key_present(monkeypatch, capsys)
     assert exit_code == 0
     assert "Using bundled free model list" not in captured.out
     assert captured.out.splitlines() == ["live/model-a", "live/model-b"]
+
+
+def test_importing_entry_point_defers_http_and_ui_stacks():
+    code = (
+        "import sys, cli_gpt.__main__; "
+        "print(sorted(m for m in ('requests', 'httpx', 'rich', 'prompt_toolkit') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_version_short_circuits_without_building_parser(capsys):
+    cli_main._build_parser.cache_clear()
+
+    assert cli_main.main(["--version"]) == 0
+
+    assert capsys.readouterr().out.strip() == f"cli-gpt {cli_main.__version__}"
+    assert cli_main._build_parser.cache_info().currsize == 0
+
+
+def test_timeout_must_be_positive(capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        cli_main.main(["--list-models", "--timeout", "0"])
+
+    assert excinfo.value.code == 2
+    assert "--timeout: must be greater than zero seconds." in capsys.readouterr().err
+
+
+def test_no_save_and_resume_are_mutually_exclusive(capsys):
+    assert cli_main._build_parser().parse_args(["--no-save"]).save_history is False
+    assert cli_main._build_parser().parse_args([]).save_history is True
+    with pytest.raises(SystemExit):
+        cli_main._build_parser().parse_args(["--no-save", "--resume"])
+    assert "not allowed with argument" in capsys.readouterr().err
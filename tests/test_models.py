@@ -0,0 +1,37 @@
+import pytest
+
+from cli_gpt.models import FREE_MODELS, ModelManager
+
+
+def test_replace_models_dedupes_and_keeps_lookups_in_sync():
+    manager = ModelManager()
+
+    manager.replace_models(["live/a", "live/b", "live/a", 42, "live/c"])
+
+    assert manager.list_models() == ("live/a", "live/b", "live/c")
+    assert manager.current_model == "live/a"
+    assert manager.is_available("live/c")
+    assert not manager.is_available(FREE_MODELS[0])
+    manager.set_model("live/b")
+    assert manager.current_model == "live/b"
+
+
+def test_replacing_with_an_identical_catalogue_keeps_the_same_tuple():
+    manager = ModelManager()
+    manager.replace_models(["live/a", "live/b"])
+    catalogue = manager.list_models()
+
+    manager.replace_models(["live/a", "live/b"])
+    assert manager.list_models() is catalogue
+    manager.replace_models(["live/b", "live/a"])
+    assert manager.list_models() == ("live/b", "live/a")
+
+
+def test_set_model_rejects_unknown_names():
+    manager = ModelManager()
+
+    with pytest.raises(ValueError, match="paid/model"):
+        manager.set_model("paid/model")
+
+    manager.set_model("paid/model", allow_unknown=True)
+    assert manager.current_model == "paid/model"
@@ -0,0 +1,89 @@
+import sys
+import time
+
+from cli_gpt.store import StateStore
+
+
+def test_latest_session_round_trips_messages_in_order(tmp_path):
+    store = StateStore(tmp_path / "state.db")
+    first = store.new_session()
+    store.append_message(first, 1, "user", "hi")
+    second = store.new_session()
+    store.append_message(second, 2, "assistant", "there")
+    store.append_message(second, 1, "user", "hello")
+    # Sessions without messages (e.g. /new followed by /quit) are never resumed.
+    store.new_session()
+    store.close()
+
+    reopened = StateStore(tmp_path / "state.db")
+
+    assert reopened.latest_session() == second
+    assert reopened.load_messages(second) == [
+        {"role": "user", "content": "hello"},
+        {"role": "assistant", "content": "there"},
+    ]
+    assert reopened._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_replies_survive_restarts_until_they_expire(tmp_path, monkeypatch):
+    store = StateStore(tmp_path / "state.db", ttl=60)
+    store.put_response("k", "m", "cached reply")
+    store.close()
+
+    assert StateStore(tmp_path / "state.db", ttl=60).get_response("k") == "cached reply"
+
+    later = time.time() + 61
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert StateStore(tmp_path / "state.db", ttl=60).get_response("k") is None
+
+
+def test_default_location_follows_the_cache_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("CLI_GPT_CACHE_DIR", str(tmp_path / "cache"))
+
+    store = StateStore()
+
+    assert store.path == tmp_path / "cache" / "state.db"
+    assert store.latest_session() is None
+
+
+def test_restored_roles_are_interned(tmp_path):
+    store = StateStore(tmp_path / "state.db")
+    session = store.new_session()
+    store.append_message(session, 1, "user", "a")
+    store.append_message(session, 2, "user", "b")
+
+    first, second = store.load_messages(session)
+
+    assert first["role"] is second["role"] is sys.intern("user")
+
+
+def test_large_messages_and_replies_are_stored_compressed(tmp_path):
+    store = StateStore(tmp_path / "state.db")
+    session = store.new_session()
+    large = "lorem ipsum " * 1024
+    store.append_message(session, 1, "user", large)
+    store.append_message(session, 2, "assistant", "short")
+    store.put_response("k", "m", large)
+
+    column_types = store._conn.execute(
+        "SELECT typeof(content) FROM messages ORDER BY idx"
+    ).fetchall()
+    assert column_types == [("blob",), ("text",)]
+    assert store.load_messages(session)[0]["content"] == large
+    assert store.get_response("k") == large
+
+
+def test_only_the_newest_sessions_are_kept(tmp_path):
+    store = StateStore(tmp_path / "state.db", max_sessions=2)
+    sessions = [store.new_session() for _ in range(3)]
+    for session in sessions:
+        store.append_message(session, 1, "user", f"hi {session}")
+    store.new_session()  # never used
+    store.close()
+
+    store = StateStore(tmp_path / "state.db", max_sessions=2)
+
+    assert store.load_messages(sessions[0]) == []
+    assert store.load_messages(sessions[2]) == [{"role": "user", "content": f"hi {sessions[2]}"}]
+    remaining = [row[0] for row in store._conn.execute("SELECT id FROM sessions ORDER BY id")]
+    assert remaining == sessions[1:]
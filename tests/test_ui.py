@@ -0,0 +1,338 @@
+import doctest
+import subprocess
+import sys
+
+from cli_gpt import ui
+
+
+def test_ui_doctests():
+    assert doctest.testmod(ui).failed == 0
+
+
+def test_chat_state_shares_the_system_prompt_across_resets():
+    state = ui.ChatState()
+    state.add_user_message("hi")
+    snapshot = state.messages()
+    state.reset()
+
+    assert state.history == [ui.SYSTEM_PROMPT]
+    assert state.history[0] is snapshot[0]
+    assert len(snapshot) == 2
+
+
+def test_timestamp_is_reformatted_only_when_the_minute_changes(monkeypatch):
+    clock = {"now": 120.0}
+    calls = []
+    monkeypatch.setattr(ui.time, "time", lambda: clock["now"])
+    monkeypatch.setattr(ui.time, "strftime", lambda fmt, t: calls.append(t) or str(len(calls)))
+    timestamp = ui._make_timestamp()
+
+    assert timestamp() == "1"
+    clock["now"] = 179.0
+    assert timestamp() == "1"
+    clock["now"] = 180.0
+    assert timestamp() == "2"
+    assert len(calls) == 2
+
+
+def make_state(turns, **kwargs):
+    state = ui.ChatState(**kwargs)
+    for index in range(turns):
+        state.add_user_message(f"q{index}")
+        state.add_ai_message(f"a{index}")
+    return state
+
+
+def test_messages_keep_the_system_prompt_and_the_latest_turns():
+    state = make_state(5, max_history_turns=3)
+    state.add_user_message("q5")
+
+    messages = state.messages()
+
+    assert messages[0] is ui.SYSTEM_PROMPT
+    assert [m["content"] for m in messages[1:]] == ["q3", "a3", "q4", "a4", "q5"]
+    assert len(state.history) == 12
+
+
+def test_messages_drop_oldest_turns_beyond_the_character_budget():
+    state = ui.ChatState(max_context_chars=20)
+    state.add_user_message("x" * 10)
+    state.add_ai_message("y" * 10)
+    state.add_user_message("next")
+
+    assert [m["content"] for m in state.messages()[1:]] == ["next"]
+    # The latest prompt is always sent, even when it alone exceeds the budget.
+    state.add_ai_message("z" * 40)
+    state.add_user_message("w" * 40)
+    assert [m["content"] for m in state.messages()[1:]] == ["w" * 40]
+
+
+def test_summary_covers_dropped_turns_until_reset():
+    state = make_state(3, max_history_turns=2)
+
+    # The next prompt fills the second slot, so only the latest full turn is kept.
+    assert [m["content"] for m in state.unsummarised_messages()] == ["q0", "a0", "q1", "a1"]
+    state.apply_summary("talked about q0")
+    assert state.unsummarised_messages() == []
+    state.add_user_message("q3")
+    assert [m["content"] for m in state.messages()[1:]] == [
+        "Summary so far: talked about q0",
+        "q2",
+        "a2",
+        "q3",
+    ]
+
+    state.reset()
+    assert state.summary is None
+    assert state.messages() == [ui.SYSTEM_PROMPT]
+
+
+def test_importing_ui_defers_terminal_libraries():
+    code = (
+        "import sys, cli_gpt.ui; "
+        "print(sorted(m for m in ('dotenv', 'rich', 'prompt_toolkit') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_trigram_candidates_narrow_to_names_sharing_every_trigram():
+    names = ["openai/gpt-4o", "google/gemma", "meta/llama-gpt", "mistral/7b"]
+    index = ui._trigram_index(names)
+
+    assert ui._trigram_candidates(index, "gpt") == {0, 2}
+    assert ui._trigram_candidates(index, "gemm") == {1}
+    assert ui._trigram_candidates(index, "zzz") == set()
+    # Needles shorter than a trigram fall back to a full scan.
+    assert ui._trigram_candidates(index, "ll") is None
+
+
+def test_typing_indicator_spins_on_the_io_loop_and_clears_its_line():
+    import io
+    import time
+
+    from rich.console import Console
+
+    from cli_gpt._loop import BackgroundLoop
+
+    app = ui.ChatApp.__new__(ui.ChatApp)
+    output = io.StringIO()
+    app.console = Console(file=output, force_terminal=True)
+    app._io = BackgroundLoop()
+    try:
+        with app._typing_indicator():
+            # Wait for the second frame rather than a fixed time, so slow runners pass.
+            deadline = time.monotonic() + 5
+            while ui.SPINNER_FRAMES[1] not in output.getvalue() and time.monotonic() < deadline:
+                time.sleep(0.01)
+    finally:
+        app._io.close()
+
+    written = output.getvalue()
+    assert written.startswith(f"\r{ui.TYPING_MESSAGE} {ui.SPINNER_FRAMES[0]}")
+    assert f"{ui.SPINNER_FRAMES[1]}" in written
+    assert written.endswith("\r\x1b[2K")
+
+
+def test_startup_fetches_models_while_the_state_database_opens(monkeypatch, tmp_path):
+    import threading
+    from types import SimpleNamespace
+
+    monkeypatch.setenv("CLI_GPT_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("CLI_GPT_EMBEDDINGS_URL", raising=False)
+    fetch_started = threading.Event()
+    overlapped = []
+
+    class FakeClient:
+        async def list_models(self, *, free_only, use_cache):
+            fetch_started.set()
+            return ["fast/model:free"]
+
+        async def aclose(self):
+            pass
+
+    class SlowStore(ui.StateStore):
+        def __init__(self, *args, **kwargs):
+            overlapped.append(fetch_started.wait(timeout=5))
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(ui.ChatApp, "_init_client", lambda self, **kwargs: FakeClient())
+    monkeypatch.setattr(ui, "StateStore", SlowStore)
+
+    app = ui.ChatApp(plain_output=True, session=SimpleNamespace())
+    try:
+        assert overlapped == [True]
+        assert list(app.model_manager.list_models()) == ["fast/model:free"]
+    finally:
+        app.close()
+
+
+def _fake_client_app(monkeypatch, tmp_path, replies):
+    from types import SimpleNamespace
+
+    monkeypatch.setenv("CLI_GPT_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("CLI_GPT_EMBEDDINGS_URL", raising=False)
+    calls = []
+
+    class FakeClient:
+        async def list_models(self, *, free_only, use_cache):
+            return ["fake/model:free"]
+
+        async def stream_chat_completion(self, messages, model):
+            calls.append(messages[-1]["content"])
+            yield replies.get(messages[-1]["content"], f"reply {len(calls)}")
+
+        async def aclose(self):
+            pass
+
+    monkeypatch.setattr(ui.ChatApp, "_init_client", lambda self, **kwargs: FakeClient())
+
+    def make_app(*inputs, **options):
+        pending = list(inputs)
+
+        def prompt(message):
+            if not pending:
+                raise EOFError
+            return pending.pop(0)
+
+        return ui.ChatApp(plain_output=True, session=SimpleNamespace(prompt=prompt), **options)
+
+    return make_app, calls
+
+
+def test_repeated_conversations_are_answered_from_the_response_caches(monkeypatch, tmp_path):
+    from cli_gpt.cache import response_cache_key
+
+    make_app, calls = _fake_client_app(monkeypatch, tmp_path, {"blank": ""})
+
+    app = make_app(
+        "hi", "/new", "hi", "/nocache fresh", "/new", "fresh", "/new", "blank", "/new", "blank"
+    )
+    try:
+        app.run()
+    finally:
+        app.close()
+    # Repeats are served from cache; /nocache neither reads nor writes it; empty
+    # replies are never cached.
+    assert calls == ["hi", "fresh", "fresh", "blank", "blank"]
+
+    # A fresh process answers from the state database and refills its in-memory LRU.
+    app = make_app("hi")
+    try:
+        app.run()
+        key = response_cache_key(
+            [ui.SYSTEM_PROMPT, {"role": ui.USER_ROLE, "content": "hi"}], "fake/model:free"
+        )
+        assert app._response_cache.get(key) == "reply 1"
+    finally:
+        app.close()
+    assert calls == ["hi", "fresh", "fresh", "blank", "blank"]
+
+
+def test_no_save_keeps_the_conversation_off_disk(monkeypatch, tmp_path):
+    make_app, calls = _fake_client_app(monkeypatch, tmp_path, {})
+
+    app = make_app("hi", save_history=False)
+    try:
+        app.run()
+    finally:
+        app.close()
+    monkeypatch.setenv("CLI_GPT_NO_SAVE", "1")
+    app = make_app("hi")
+    try:
+        app.run()
+    finally:
+        app.close()
+
+    assert calls == ["hi", "hi"]
+    assert not (tmp_path / "state.db").exists()
+
+
+def test_models_popup_resets_between_opens_and_flushes_a_pending_filter(monkeypatch):
+    from prompt_toolkit.application import create_app_session
+    from prompt_toolkit.input import create_pipe_input
+    from prompt_toolkit.output import DummyOutput
+
+    index_builds = []
+    build_index = ui._trigram_index
+    monkeypatch.setattr(
+        ui, "_trigram_index", lambda names: index_builds.append(1) or build_index(names)
+    )
+    catalogue = tuple(f"vendor/model-{idx}" for idx in range(ui.TRIGRAM_INDEX_MIN_MODELS))
+    catalogue = ("one/a", "three/c", "four/d") + catalogue
+
+    app = ui.ChatApp.__new__(ui.ChatApp)
+    with create_pipe_input() as pipe, create_app_session(input=pipe, output=DummyOutput()):
+        open_popup = app._build_models_popup()
+
+        # Enter lands before the debounce timer fires, so it must apply "thr" itself.
+        pipe.send_text("/thr\r\r")
+        assert open_popup(catalogue, "one/a") == "three/c"
+
+        # The next open starts unfiltered, on the active model.
+        pipe.send_text("\x1b[B\r")
+        assert open_popup(catalogue, "three/c") == "four/d"
+
+        pipe.send_text("/four\r\x1b[A\r")
+        assert open_popup(catalogue, "three/c") == "four/d"
+
+        pipe.send_text("\r")
+        assert open_popup(catalogue, "one/a") == "one/a"
+
+    # The per-catalogue index is built once for an unchanged catalogue.
+    assert index_builds == [1]
+
+
+def test_plain_stream_ends_its_line_when_the_stream_fails():
+    import io
+
+    import pytest
+    from rich.console import Console
+
+    app = ui.ChatApp.__new__(ui.ChatApp)
+    app._use_rich_rendering = False
+    output = io.StringIO()
+    app.console = Console(file=output)
+
+    def failing_stream():
+        yield "partial"
+        raise RuntimeError("stream broke")
+
+    with pytest.raises(RuntimeError):
+        app._render_ai_stream("Hi ", failing_stream())
+
+    assert output.getvalue().endswith("AI: Hi partial\n")
+
+
+def test_failed_startup_releases_the_io_loop_and_state_database(monkeypatch, tmp_path):
+    import sqlite3
+
+    import pytest
+
+    make_app, _ = _fake_client_app(monkeypatch, tmp_path, {})
+    loops, stores = [], []
+
+    class TrackedLoop(ui.BackgroundLoop):
+        def __init__(self):
+            super().__init__()
+            loops.append(self)
+
+    class TrackedStore(ui.StateStore):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            stores.append(self)
+
+    def interrupted(self, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(ui, "BackgroundLoop", TrackedLoop)
+    monkeypatch.setattr(ui, "StateStore", TrackedStore)
+    monkeypatch.setattr(ui.ChatApp, "_refresh_models_from_api", interrupted)
+
+    with pytest.raises(KeyboardInterrupt):
+        make_app()
+
+    assert loops[0].loop.is_closed()
+    with pytest.raises(sqlite3.ProgrammingError):
+        stores[0].latest_session()